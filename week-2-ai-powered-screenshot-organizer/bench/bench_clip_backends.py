@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+CLIP backend benchmark
+Classifies a folder of screenshots with each clip_backend and compares
+speed and decisions against the plain torch backend
+"""
+
+import os
+import sys
+import argparse
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from organize_screenshots import ScreenshotOrganizer, ImageRecord
+
+# Documented tolerance vs the torch backend: share of images that must keep
+# the same category, and the largest allowed change in any category probability
+MIN_AGREEMENT = 0.99
+MAX_PROB_DIFF = {'torch': 0.0, 'torch_int8': 0.02, 'onnx': 0.001}
+
+
+def run_backend(organizer, images, backend, batch_size):
+    """Classify every image with one backend; returns (probabilities, seconds)"""
+    import torch
+
+    organizer.config['clip_backend'] = backend
+    organizer.load_clip_backend()
+    if organizer.clip_backend != backend:
+        return None, None
+
+    # Warm-up so session/quantization setup isn't billed to the timing
+    organizer._clip_probabilities(images[:1])
+
+    batches = []
+    start = time.perf_counter()
+    for i in range(0, len(images), batch_size):
+        batches.append(organizer._clip_probabilities(images[i:i + batch_size]))
+    return torch.cat(batches), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CLIP backends')
+    parser.add_argument('folder', help='Folder with sample screenshots')
+    parser.add_argument('--config', '-c', default='config.json',
+                        help='Config file with your categories (default: config.json)')
+    parser.add_argument('--limit', type=int, default=64,
+                        help='Maximum number of images to use (default: 64)')
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help='Images per forward pass (default: 16)')
+    parser.add_argument('--backends', nargs='+', choices=ScreenshotOrganizer.CLIP_BACKENDS,
+                        default=list(ScreenshotOrganizer.CLIP_BACKENDS),
+                        help='Backends to run (torch always runs)')
+    args = parser.parse_args()
+
+    organizer = ScreenshotOrganizer(args.config)
+    organizer.config['clip_backend'] = 'torch'
+    organizer.load_clip_model()
+    if not organizer.clip_model:
+        sys.exit(1)
+
+    paths = organizer.find_images(args.folder)[:args.limit]
+    if not paths:
+        print("❌ No images found!")
+        sys.exit(1)
+
+    print(f"📸 Decoding {len(paths)} images...")
+    images = [ImageRecord.load(p).image for p in paths]
+
+    backends = ['torch'] + [backend for backend in args.backends if backend != 'torch']
+    baseline, baseline_seconds = None, None
+
+    print(f"\n{'Backend':<12} {'images/s':>9} {'Speedup':>8} {'Same category':>14} {'Max prob diff':>14}")
+    print("-" * 61)
+
+    for backend in backends:
+        probs, seconds = run_backend(organizer, images, backend, args.batch_size)
+        if probs is None:
+            print(f"{backend:<12} {'unavailable':>9}")
+            continue
+        if backend == 'torch':
+            baseline, baseline_seconds = probs, seconds
+
+        agreement = (probs.argmax(dim=1) == baseline.argmax(dim=1)).float().mean().item()
+        max_diff = (probs - baseline).abs().max().item()
+        within = agreement >= MIN_AGREEMENT and max_diff <= MAX_PROB_DIFF[backend]
+        print(f"{backend:<12} {len(images) / seconds:>9.1f} {baseline_seconds / seconds:>7.2f}x "
+              f"{agreement:>13.0%} {max_diff:>14.5f} {'✅' if within else '⚠️  outside tolerance'}")
+
+
+if __name__ == '__main__':
+    main()
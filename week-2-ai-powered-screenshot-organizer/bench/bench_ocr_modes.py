@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+OCR speed vs accuracy benchmark
+Runs OCR over a folder of screenshots under each resolution/early-stop mode
+and compares keyword hits against full-resolution OCR
+"""
+
+import os
+import sys
+import argparse
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from organize_screenshots import ScreenshotOrganizer, ImageRecord, KeywordMatcher
+
+# Config overrides for each mode; 'baseline' is full-resolution OCR
+MODES = {
+    'baseline': {},
+    'max_side_1920': {'ocr_max_side': 1920},
+    'max_side_1280': {'ocr_max_side': 1280},
+    'canvas_1280': {'ocr_canvas_size': 1280},
+    'first_10_regions': {'ocr_max_regions': 10},
+    'first_200_chars': {'ocr_max_chars': 200},
+    'fast': {'ocr_max_side': 1920, 'ocr_canvas_size': 1280, 'ocr_max_chars': 200},
+}
+
+
+def run_mode(organizer, records, overrides):
+    """OCR every record with the given config overrides; returns (texts, seconds)"""
+    saved = {key: organizer.config[key] for key in overrides}
+    organizer.config.update(overrides)
+    try:
+        texts = []
+        start = time.perf_counter()
+        for record in records:
+            text, _ = organizer.run_ocr(record)
+            texts.append(text)
+        return texts, time.perf_counter() - start
+    finally:
+        organizer.config.update(saved)
+
+
+def compare(matcher, baseline_texts, texts):
+    """Share of images with the same OCR category, and share of baseline keyword hits kept"""
+    same_category = 0
+    kept_hits = 0
+    baseline_hits = 0
+
+    for baseline_text, text in zip(baseline_texts, texts):
+        if matcher.best(baseline_text)[0] == matcher.best(text)[0]:
+            same_category += 1
+        base_scores = matcher.scores(baseline_text)
+        scores = matcher.scores(text)
+        baseline_hits += sum(base_scores)
+        kept_hits += sum(min(a, b) for a, b in zip(base_scores, scores))
+
+    agreement = same_category / len(texts) if texts else 1.0
+    recall = kept_hits / baseline_hits if baseline_hits else 1.0
+    return agreement, recall
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark OCR resolution modes')
+    parser.add_argument('folder', help='Folder with sample screenshots')
+    parser.add_argument('--config', '-c', default='config.json',
+                        help='Config file with your categories (default: config.json)')
+    parser.add_argument('--limit', type=int, default=50,
+                        help='Maximum number of images to use (default: 50)')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES),
+                        help='Modes to run (baseline always runs)')
+    args = parser.parse_args()
+
+    organizer = ScreenshotOrganizer(args.config)
+    organizer.load_ocr_model()
+    if not organizer.ocr_reader:
+        sys.exit(1)
+
+    paths = organizer.find_images(args.folder)[:args.limit]
+    if not paths:
+        print("❌ No images found!")
+        sys.exit(1)
+
+    print(f"📸 Decoding {len(paths)} images...")
+    records = [ImageRecord.load(p) for p in paths]
+    for record in records:
+        record.grey
+
+    matcher = KeywordMatcher(organizer.config['categories'])
+
+    # Warm-up so model initialization isn't billed to the first mode
+    organizer.run_ocr(records[0])
+
+    modes = ['baseline'] + [mode for mode in args.modes if mode != 'baseline']
+    baseline_texts, baseline_seconds = None, None
+
+    print(f"\n{'Mode':<18} {'s/image':>8} {'Speedup':>8} {'Same category':>14} {'Keyword recall':>15}")
+    print("-" * 67)
+
+    for mode in modes:
+        texts, seconds = run_mode(organizer, records, MODES[mode])
+        if mode == 'baseline':
+            baseline_texts, baseline_seconds = texts, seconds
+
+        agreement, recall = compare(matcher, baseline_texts, texts)
+        print(f"{mode:<18} {seconds / len(records):>8.3f} {baseline_seconds / seconds:>7.2f}x "
+              f"{agreement:>13.0%} {recall:>14.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark harness
+Generates the synthetic corpus, organizes it under each scenario (every
+scenario in a fresh process, so memory numbers don't carry over) and
+appends throughput, per-stage latency and peak memory to a results file
+for comparison across commits
+"""
+
+import os
+import sys
+import argparse
+import contextlib
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic_corpus import generate_corpus, RESOLUTIONS
+
+# Config overrides for each scenario
+SCENARIOS = {
+    'serial': {},
+    'serial_unbatched': {'clip_batch_size': 1},
+    'cascade_auto': {'cascade': 'auto'},
+    'ocr_fast': {'ocr_max_side': 1920, 'ocr_canvas_size': 1280, 'ocr_max_chars': 200},
+    'pipeline_4': {'workers': 4},
+}
+
+RESULT_MARKER = 'BENCH_RESULT '
+
+
+def run_scenario(spec):
+    """Organize the corpus once in this process and return the measurements"""
+    from organize_screenshots import ScreenshotOrganizer
+    from stub_models import install_stub_models
+
+    organizer = ScreenshotOrganizer(spec['config'])
+    with tempfile.TemporaryDirectory(prefix='screenshot_bench_') as output:
+        organizer.config.update({
+            'source_folder': spec['corpus'],
+            'destination_folder': output,
+            'cache_folder': os.path.join(spec['corpus'], '.cache'),
+            'move_or_copy': 'copy',
+            'recursive': False,
+            'result_cache': False,
+            'near_duplicates': False,
+            'journal': False,
+            'metrics_file': '',
+        })
+        organizer.config.update(spec['overrides'])
+        if spec['models'] == 'stub':
+            install_stub_models(organizer, spec['stub_ocr_ms'], spec['stub_clip_ms'])
+
+        # Remember where each file went, to score against the manifest
+        placed = {}
+        place_file = organizer.place_file
+
+        def tracking_place_file(image, category, ocr_text):
+            placed[os.path.basename(getattr(image, 'path', str(image)))] = category
+            return place_file(image, category, ocr_text)
+
+        organizer.place_file = tracking_place_file
+
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            organizer.organize_once()
+        wall_seconds = time.perf_counter() - start
+
+    snapshot = organizer.metrics.snapshot(organizer.stats)
+    snapshot['wall_seconds'] = wall_seconds
+    snapshot['placed'] = placed
+    return snapshot
+
+
+def score(manifest, placed):
+    """Share of text screenshots that landed in their expected category"""
+    expected = {name: info['category'] for name, info in manifest['files'].items() if info['category']}
+    if not expected:
+        return None
+    return sum(placed.get(name) == category for name, category in expected.items()) / len(expected)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_result(results_path, entry):
+    """Most recent earlier result for the same scenario, models and corpus from another commit/label"""
+    if not os.path.exists(results_path):
+        return None
+    match = None
+    with open(results_path, 'r') as f:
+        for line in f:
+            try:
+                old = json.loads(line)
+            except ValueError:
+                continue
+            same_setup = all(old.get(key) == entry[key] for key in ('scenario', 'models', 'corpus'))
+            if same_setup and (old.get('label'), old.get('commit')) != (entry['label'], entry['commit']):
+                match = old
+    return match
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the end-to-end benchmark suite')
+    parser.add_argument('--config', '-c', default='config.json',
+                        help='Config file with your categories and models (default: config.json)')
+    parser.add_argument('--models', choices=['stub', 'real'], default='stub',
+                        help='stub: no weights needed; real: the configured CLIP/EasyOCR (default: stub)')
+    parser.add_argument('--offline', action='store_true',
+                        help='Only use locally cached model weights (no downloads)')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help='Scenarios to run (default: all)')
+    parser.add_argument('--corpus', default=os.path.join(BENCH_DIR, '.corpus'),
+                        help='Corpus folder, generated if missing (default: bench/.corpus)')
+    parser.add_argument('--per-kind', type=int, default=10,
+                        help='Corpus images per kind (default: 10)')
+    parser.add_argument('--resolutions', nargs='+', choices=list(RESOLUTIONS), default=list(RESOLUTIONS),
+                        help='Corpus resolutions (default: all)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Corpus seed (default: 0)')
+    parser.add_argument('--stub-ocr-ms', type=float, default=100.0,
+                        help='Stub OCR cost in ms per megapixel (default: 100)')
+    parser.add_argument('--stub-clip-ms', type=float, default=20.0,
+                        help='Stub CLIP cost in ms per image (default: 20)')
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results.jsonl'),
+                        help='Results file, one JSON line per scenario run (default: bench/results.jsonl)')
+    parser.add_argument('--label', default='',
+                        help='Free-form label stored with the results (e.g. "before-fix")')
+    parser.add_argument('--run-scenario', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        # Child process: run one scenario and hand the result back on stdout
+        result = run_scenario(json.loads(args.run_scenario))
+        print(RESULT_MARKER + json.dumps(result), flush=True)
+        return
+
+    print(f"📸 Preparing corpus in {args.corpus}...")
+    manifest = generate_corpus(args.corpus, args.per_kind, args.resolutions, args.seed)
+    print(f"  {len(manifest['files'])} images")
+
+    env = dict(os.environ)
+    if args.offline:
+        env.update({'HF_HUB_OFFLINE': '1', 'TRANSFORMERS_OFFLINE': '1'})
+
+    commit = git_commit()
+    print(f"\n{'Scenario':<18} {'images/s':>9} {'First s':>8} {'p50 ms':>8} {'p95 ms':>8} {'Peak MB':>8} "
+          f"{'Accuracy':>9} {'vs previous':>12}")
+    print("-" * 87)
+
+    for name in args.scenarios:
+        spec = {
+            'config': os.path.abspath(args.config),
+            'corpus': os.path.abspath(args.corpus),
+            'overrides': SCENARIOS[name],
+            'models': args.models,
+            'stub_ocr_ms': args.stub_ocr_ms,
+            'stub_clip_ms': args.stub_clip_ms,
+        }
+        child = subprocess.run([sys.executable, os.path.abspath(__file__), '--run-scenario', json.dumps(spec)],
+                               capture_output=True, text=True, env=env)
+        lines = [line for line in child.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+        if child.returncode != 0 or not lines:
+            print(f"{name:<18} ❌ failed")
+            print(child.stderr.strip()[-2000:])
+            continue
+
+        result = json.loads(lines[-1][len(RESULT_MARKER):])
+        placed = result.pop('placed')
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'label': args.label,
+            'commit': commit,
+            'scenario': name,
+            'overrides': SCENARIOS[name],
+            'models': args.models if args.models == 'real' else
+                      f"stub(ocr={args.stub_ocr_ms}ms/MP, clip={args.stub_clip_ms}ms)",
+            'corpus': manifest['params'],
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'images': len(placed),
+            'accuracy': score(manifest, placed) if args.models == 'real' else None,
+            **result,
+        }
+
+        previous = previous_result(args.output, entry)
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+        # Per-image totals only exist in serial mode; the pipeline overlaps images
+        total = entry['stages'].get('total')
+        p50 = f"{total['p50_seconds'] * 1000:.1f}" if total else '-'
+        p95 = f"{total['p95_seconds'] * 1000:.1f}" if total else '-'
+        speedup = ''
+        if previous and previous.get('images_per_second'):
+            speedup = f"{entry['images_per_second'] / previous['images_per_second']:.2f}x"
+        accuracy = f"{entry['accuracy']:.0%}" if entry['accuracy'] is not None else '-'
+        peak = f"{entry['peak_rss_bytes'] / 1e6:.0f}" if entry['peak_rss_bytes'] else '-'
+        first = f"{entry['first_result_seconds']:.2f}" if entry.get('first_result_seconds') is not None else '-'
+        print(f"{name:<18} {entry['images_per_second']:>9.2f} {first:>8} {p50:>8} {p95:>8} {peak:>8} "
+              f"{accuracy:>9} {speedup:>12}")
+
+    print(f"\n📄 Results appended to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
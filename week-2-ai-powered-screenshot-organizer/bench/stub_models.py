@@ -0,0 +1,90 @@
+"""
+Stub OCR and CLIP models for offline benchmarks
+They implement the interfaces the organizer uses (EasyOCR detect/recognize,
+CLIP category probabilities) with deterministic output and a configurable
+cost per image, so everything around the models can be measured without
+downloading any weights. Categories they produce are not meaningful.
+"""
+
+import functools
+import time
+
+
+class StubOCRReader:
+    """
+    Stands in for easyocr.Reader
+
+    detect() reports one text region per band of high-contrast rows and
+    costs ms_per_megapixel (scaled to the detector canvas, like EasyOCR);
+    recognize() returns one keyword per region, picked from the configured
+    categories by the region's pixels.
+    """
+
+    ROW_STEP = 8
+
+    def __init__(self, categories, ms_per_megapixel=100.0):
+        self.keywords = [keyword for keywords in categories.values() for keyword in keywords] or ['text']
+        self.ms_per_megapixel = ms_per_megapixel
+
+    def _spend(self, pixels, share):
+        time.sleep(self.ms_per_megapixel * share * pixels / 1e6 / 1000)
+
+    def detect(self, image, canvas_size=2560, reformat=False, **kwargs):
+        height, width = image.shape[:2]
+        scale = min(1.0, canvas_size / max(height, width))
+        self._spend(height * width * scale * scale, 0.6)
+
+        grey = image.mean(axis=2) if image.ndim == 3 else image
+        active = (grey[::self.ROW_STEP].std(axis=1) > 8).tolist() + [False]
+        boxes, start = [], None
+        for row, on in enumerate(active):
+            if on and start is None:
+                start = row
+            elif not on and start is not None:
+                boxes.append([0, width, start * self.ROW_STEP, row * self.ROW_STEP])
+                start = None
+        return [boxes], [[]]
+
+    def recognize(self, grey, horizontal_list=None, free_list=None, detail=0, reformat=False, **kwargs):
+        regions = list(horizontal_list or [])
+        self._spend(sum((x1 - x0) * (y1 - y0) for x0, x1, y0, y1 in regions), 0.4)
+
+        words = []
+        for x0, x1, y0, y1 in regions:
+            value = int(grey[y0:y1, x0:x1].mean() * 1000)
+            words.append(self.keywords[value % len(self.keywords)])
+        return words
+
+
+def load_stub_clip(organizer, ms_per_image=20.0):
+    """Install a deterministic stand-in for the CLIP model on organizer"""
+    import numpy as np
+    import torch
+    from PIL import Image
+
+    organizer.category_names = list(organizer.config['categories'].keys())
+    generator = torch.Generator().manual_seed(0)
+    projection = torch.randn(8 * 8 * 3, len(organizer.category_names), generator=generator)
+
+    def clip_probabilities(images, records=None):
+        time.sleep(ms_per_image * len(images) / 1000)
+        features = torch.stack([
+            torch.from_numpy(np.asarray(image.resize((8, 8), Image.BILINEAR), dtype=np.float32).flatten())
+            for image in images
+        ]) / 255 - 0.5
+        return (features @ projection).softmax(dim=1)
+
+    organizer.device = 'cpu'
+    organizer.clip_model = 'stub'
+    organizer.clip_backend = 'stub'
+    organizer.category_embeddings = projection
+    organizer._clip_probabilities = clip_probabilities
+    print("  ✅ CLIP loaded (stub)")
+
+
+def install_stub_models(organizer, ocr_ms_per_megapixel=100.0, clip_ms_per_image=20.0):
+    """Make organizer load the stubs instead of EasyOCR and CLIP (also in pipeline workers)"""
+    organizer.ocr_reader_factory = functools.partial(
+        StubOCRReader, organizer.config['categories'], ocr_ms_per_megapixel
+    )
+    organizer.load_clip_model = functools.partial(load_stub_clip, organizer, clip_ms_per_image)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic screenshot corpus
+Renders fake code, error, chat and receipt screenshots plus textless images
+at several resolutions, fully offline, with a manifest of expected categories
+"""
+
+import os
+import argparse
+import json
+import random
+from pathlib import Path
+
+# Kind of screenshot -> category it should end up in (None = no text, any category)
+KINDS = {
+    'code': 'Code',
+    'errors': 'Errors',
+    'chats': 'Chats',
+    'receipts': 'Receipts',
+    'textless': None,
+}
+
+RESOLUTIONS = {
+    'hd': (1280, 800),
+    'fhd': (1920, 1080),
+    '4k': (3840, 2160),
+}
+
+# Bump when the rendering changes, so cached corpora are regenerated
+CORPUS_VERSION = 1
+
+IDENTIFIERS = ['user', 'items', 'config', 'result', 'path', 'count', 'data', 'index', 'value', 'cache']
+NAMES = ['Alex', 'Sam', 'Priya', 'Jordan', 'Mei', 'Tom', 'Lena', 'Omar']
+PRODUCTS = ['Coffee', 'Bagel', 'Notebook', 'USB cable', 'Headphones', 'Sandwich', 'Water', 'Pens']
+MESSAGES = ['are we still on for tonight?', 'sent you the file', 'haha that meme', 'running late, 10 min',
+            'can you check the message I sent', 'see you tomorrow', 'call me when free', 'thanks!']
+
+
+def _code_lines(rng, count):
+    lines = [f"{rng.choice(IDENTIFIERS)}.py - Code Editor", ""]
+    lines += [f"import {rng.choice(['os', 'sys', 'json', 're'])}", ""]
+    while len(lines) < count:
+        name = rng.choice(IDENTIFIERS)
+        lines += [f"def get_{name}({rng.choice(IDENTIFIERS)}):",
+                  f"    {name} = load_{rng.choice(IDENTIFIERS)}()",
+                  f"    for item in {name}:",
+                  "        print(item)  # script output to console",
+                  f"    return {name}", ""]
+    return lines[:count]
+
+
+def _error_lines(rng, count):
+    lines = ["Terminal", "Traceback (most recent call last):"]
+    while len(lines) < count - 2:
+        lines += [f'  File "/app/{rng.choice(IDENTIFIERS)}.py", line {rng.randint(1, 400)}, in run',
+                  f"    {rng.choice(IDENTIFIERS)}[{rng.randint(0, 9)}]"]
+    return lines[:count - 2] + [f"KeyError: '{rng.choice(IDENTIFIERS)}'",
+                                "Error: build failed with 1 exception (warning: retrying)"]
+
+
+def _chat_lines(rng, count):
+    lines = [f"WhatsApp - chat with {rng.choice(NAMES)}", ""]
+    while len(lines) < count:
+        lines.append(f"{rng.choice(NAMES)}: {rng.choice(MESSAGES)}")
+        lines.append(f"    {rng.randint(8, 22)}:{rng.randint(0, 59):02d} message delivered")
+    return lines[:count]
+
+
+def _receipt_lines(rng, count):
+    lines = ["RECEIPT", f"Invoice #{rng.randint(10000, 99999)}", ""]
+    total = 0.0
+    while len(lines) < count - 3:
+        price = rng.randint(100, 4000) / 100
+        total += price
+        lines.append(f"{rng.choice(PRODUCTS):<20} ${price:>8.2f}")
+    return lines[:count - 3] + ["", f"{'TOTAL':<20} ${total:>8.2f}", "Payment: card - thank you, keep this bill"]
+
+
+TEXT_RENDERERS = {
+    'code': (_code_lines, (30, 30, 30), (212, 212, 212)),
+    'errors': (_error_lines, (12, 12, 12), (255, 110, 110)),
+    'chats': (_chat_lines, (236, 229, 221), (20, 20, 20)),
+    'receipts': (_receipt_lines, (255, 255, 255), (0, 0, 0)),
+}
+
+
+def _font(size):
+    from PIL import ImageFont
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the small bitmap font
+        return ImageFont.load_default()
+
+
+def render_text(rng, kind, size):
+    """A screenshot of the given kind: a title bar plus lines of text"""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    make_lines, background, foreground = TEXT_RENDERERS[kind]
+    font_size = max(10, height // 45)
+    line_height = int(font_size * 1.5)
+
+    image = Image.new('RGB', size, background)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle([0, 0, width, line_height], fill=tuple(max(0, c - 25) for c in background))
+
+    font = _font(font_size)
+    lines = make_lines(rng, rng.randint(8, max(9, height // line_height - 2)))
+    for i, line in enumerate(lines):
+        draw.text((font_size, int(line_height * (i + 0.2))), line, fill=foreground, font=font)
+    return image
+
+
+def render_textless(rng, size):
+    """A photo-like image without text: gradient, soft shapes and sensor noise"""
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFilter
+
+    width, height = size
+    np_rng = np.random.default_rng(rng.randint(0, 2 ** 32 - 1))
+    top = np.array([rng.randint(0, 255) for _ in range(3)], dtype=np.float32)
+    bottom = np.array([rng.randint(0, 255) for _ in range(3)], dtype=np.float32)
+    ramp = np.linspace(0, 1, height, dtype=np.float32)[:, None, None]
+    pixels = np.broadcast_to(top + (bottom - top) * ramp, (height, width, 3))
+
+    image = Image.fromarray(pixels.astype(np.uint8))
+    draw = ImageDraw.Draw(image)
+    for _ in range(rng.randint(3, 8)):
+        x, y = rng.randint(0, width), rng.randint(0, height)
+        radius = rng.randint(height // 10, height // 3)
+        draw.ellipse([x - radius, y - radius, x + radius, y + radius],
+                     fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    image = image.filter(ImageFilter.GaussianBlur(radius=max(2, height // 100)))
+
+    noise = np_rng.normal(0, 4, (height, width, 3))
+    return Image.fromarray(np.clip(np.asarray(image, dtype=np.float32) + noise, 0, 255).astype(np.uint8))
+
+
+def generate_corpus(folder, per_kind=10, resolutions=('hd', 'fhd', '4k'), seed=0):
+    """
+    Write the corpus to folder and return its manifest
+
+    Every image gets its own random generator seeded from (seed, kind,
+    index), so the same parameters always produce the same files. If folder
+    already holds a corpus with the same parameters it is reused as is.
+    """
+    folder = Path(folder)
+    manifest_path = folder / 'manifest.json'
+    params = {'version': CORPUS_VERSION, 'per_kind': per_kind,
+              'resolutions': list(resolutions), 'seed': seed}
+
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get('params') == params:
+            return manifest
+        for name in manifest.get('files', {}):
+            (folder / name).unlink(missing_ok=True)
+
+    folder.mkdir(parents=True, exist_ok=True)
+    files = {}
+    for kind, category in KINDS.items():
+        for index in range(per_kind):
+            resolution = resolutions[index % len(resolutions)]
+            rng = random.Random(f"{seed}:{kind}:{index}")
+            size = RESOLUTIONS[resolution]
+            if kind == 'textless':
+                image = render_textless(rng, size)
+            else:
+                image = render_text(rng, kind, size)
+
+            name = f"{kind}_{index:03d}_{resolution}.png"
+            image.save(folder / name)
+            files[name] = {'kind': kind, 'category': category, 'resolution': resolution}
+
+    manifest = {'params': params, 'files': files}
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the synthetic benchmark corpus')
+    parser.add_argument('folder', help='Output folder')
+    parser.add_argument('--per-kind', type=int, default=10,
+                        help='Images per kind (default: 10)')
+    parser.add_argument('--resolutions', nargs='+', choices=list(RESOLUTIONS), default=list(RESOLUTIONS),
+                        help='Resolutions to cycle through (default: all)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.folder, args.per_kind, args.resolutions, args.seed)
+    print(f"📸 {len(manifest['files'])} images in {os.path.abspath(args.folder)}")
+
+
+if __name__ == '__main__':
+    main()
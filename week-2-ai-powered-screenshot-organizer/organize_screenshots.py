@@ -8,7 +8,15 @@ import os
 import sys
 import json
 import argparse
+import hashlib
+import io
+import itertools
+import math
+import re
 import shutil
+import sqlite3
+import threading
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 import time
@@ -16,410 +24,4958 @@ import time
 # Check if running in Colab
 IS_COLAB = 'COLAB_GPU' in os.environ or 'COLAB_TPU_ADDR' in os.environ
 
-class ScreenshotOrganizer:
-    def __init__(self, config_path='config.json'):
-        self.config = self.load_config(config_path)
-        self.stats = {
-            'total': 0,
-            'processed': 0,
-            'failed': 0,
-            'categories': {}
+
+def _feature_tensor(output):
+    """
+    Return the projected embedding tensor from a CLIP get_*_features call
+
+    Older transformers releases return the tensor directly, newer ones wrap
+    it in a model output object with the embeddings in pooler_output
+    """
+    return getattr(output, 'pooler_output', output)
+
+
+def _clip_image_tower(clip_model):
+    """
+    Wrap the image half of a CLIPModel as a standalone torch module
+
+    Maps pixel_values to L2-normalized image embeddings, the same numbers
+    get_image_features produces, but without the text tower attached, so
+    the module can be quantized or exported to ONNX on its own
+    """
+    import torch
+
+    class ClipImageTower(torch.nn.Module):
+        def __init__(self, vision_model, visual_projection):
+            super().__init__()
+            self.vision_model = vision_model
+            self.visual_projection = visual_projection
+
+        def forward(self, pixel_values):
+            pooled = self.vision_model(pixel_values=pixel_values).pooler_output
+            features = self.visual_projection(pooled)
+            return features / features.norm(dim=-1, keepdim=True)
+
+    return ClipImageTower(clip_model.vision_model, clip_model.visual_projection).eval()
+
+
+class KeywordMatcher:
+    """
+    Precompiled keyword matcher for OCR text
+
+    All keywords from all categories are compiled into one regular
+    expression, built as a trie so the cost per character doesn't grow with
+    the number of keywords. A single scan of the OCR text returns how many
+    keyword hits each category got.
+
+    Keywords only match whole words: "def" matches "def main()" but not
+    "undefined", and "ui" doesn't match "build". Multi-word keywords like
+    "pull request" work too.
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self.keyword_categories = {}  # keyword -> category indices
+
+        for index, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if keyword and index not in self.keyword_categories.setdefault(keyword, []):
+                    self.keyword_categories[keyword].append(index)
+
+        self.pattern = None
+        if self.keyword_categories:
+            trie = {}
+            for keyword in self.keyword_categories:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[''] = True
+            self.pattern = re.compile(r'(?<!\w)(' + self._trie_regex(trie) + r')(?!\w)')
+
+    @classmethod
+    def _trie_regex(cls, node):
+        """Turn a character trie into a regex that prefers the longest keyword"""
+        branches = [re.escape(char) + cls._trie_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A keyword ends here but longer ones continue - try those first
+            return '(?:' + body + ')?'
+        return body
+
+    def scores(self, text):
+        """Keyword hit count per category, in config order"""
+        counts = [0] * len(self.categories)
+        if self.pattern and text:
+            for match in self.pattern.finditer(text):
+                for index in self.keyword_categories[match.group(1)]:
+                    counts[index] += 1
+        return counts
+
+    def best(self, text):
+        """
+        Return (category, hits) for the category with the most keyword hits
+
+        Ties go to the category listed first in config. (None, 0) if no
+        keyword matched.
+        """
+        counts = self.scores(text)
+        best_index = max(range(len(counts)), key=lambda i: (counts[i], -i), default=None)
+        if best_index is None or counts[best_index] == 0:
+            return None, 0
+        return self.categories[best_index], counts[best_index]
+
+
+class ImageRecord:
+    """
+    A screenshot that is read, stat'ed and decoded exactly once
+
+    The file is read in one go when the record is created. The content hash
+    is computed from those same bytes, and the image is decoded only when a
+    model first needs pixels, so a result-cache hit never decodes at all.
+    The record is passed to OCR, CLIP, generate_filename and place_file,
+    so no stage opens or stats the file again.
+    """
+
+    __slots__ = ('path', 'stat', 'content_hash', 'decode_seconds', 'embedding',
+                 '_data', '_image', '_array', '_grey', '_dhash')
+
+    def __init__(self, path, stat, data, content_hash=None):
+        self.path = path
+        self.stat = stat
+        self.content_hash = content_hash
+        self.decode_seconds = None
+        # CLIP image embedding, set when CLIP runs (see EmbeddingIndex)
+        self.embedding = None
+        self._data = data
+        self._image = None
+        self._array = None
+        self._grey = None
+        self._dhash = None
+
+    @classmethod
+    def load(cls, image_path, compute_hash=False):
+        """Read the file (and stat it) once; optionally hash the bytes for the result cache"""
+        image_path = str(image_path)
+        with open(image_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+
+        content_hash = ResultCache.hash_bytes(data) if compute_hash else None
+        return cls(image_path, stat, data, content_hash)
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    @property
+    def image(self):
+        """Decoded RGB PIL image (decoded on first access)"""
+        if self._image is None:
+            from PIL import Image
+
+            if self._data is not None:
+                start = time.perf_counter()
+                self._image = Image.open(io.BytesIO(self._data)).convert('RGB')
+                self.decode_seconds = time.perf_counter() - start
+                # The encoded bytes aren't needed once we have pixels
+                self._data = None
+            else:
+                self._image = Image.fromarray(self._array)
+        return self._image
+
+    @property
+    def array(self):
+        """RGB pixels as a numpy array (shares memory with the PIL image where possible)"""
+        if self._array is None:
+            import numpy as np
+            self._array = np.asarray(self.image)
+        return self._array
+
+    @property
+    def grey(self):
+        """Grayscale pixels as a numpy array, used by OCR text recognition"""
+        if self._grey is None:
+            import numpy as np
+            self._grey = np.asarray(self.image.convert('L'))
+        return self._grey
+
+    @property
+    def dhash(self):
+        """
+        64-bit perceptual difference hash (dHash)
+
+        The image is shrunk to 9x8 grey pixels and each bit records whether a
+        pixel is brighter than its right neighbour. Re-encoded, resized or
+        slightly changed copies of a screenshot get hashes a few bits apart.
+        """
+        if self._dhash is None:
+            import numpy as np
+            from PIL import Image
+
+            small = np.asarray(self.image.convert('L').resize((9, 8), Image.BOX), dtype=np.int16)
+            bits = (small[:, 1:] > small[:, :-1]).flatten()
+            self._dhash = int.from_bytes(np.packbits(bits).tobytes(), 'big')
+        return self._dhash
+
+    def release(self):
+        """Drop all pixel buffers once the record has been placed"""
+        self._data = None
+        self._image = None
+        self._array = None
+        self._grey = None
+
+    def __getstate__(self):
+        # Only ship decoded pixels to OCR worker processes, not bytes + PIL image
+        return {'path': self.path, 'stat': self.stat,
+                'content_hash': self.content_hash, 'array': self.array}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.stat = state['stat']
+        self.content_hash = state['content_hash']
+        self.decode_seconds = None
+        self.embedding = None
+        self._data = None
+        self._image = None
+        self._array = state['array']
+        self._grey = None
+        self._dhash = None
+
+
+# near_duplicate argument default: not looked up yet (None means "looked up, no match")
+NOT_LOOKED_UP = object()
+
+
+# Per-process organizer used by the OCR worker pool (see organize_pipeline)
+_OCR_WORKER = None
+
+
+def _ocr_worker_init(config_path, config, ocr_reader_factory=None):
+    """Load EasyOCR (or the organizer's ocr_reader_factory) once in each OCR worker process"""
+    global _OCR_WORKER
+    import torch
+    # Each process gets one core - the pool provides the parallelism
+    torch.set_num_threads(1)
+
+    _OCR_WORKER = ScreenshotOrganizer(config_path)
+    _OCR_WORKER.config = config
+    _OCR_WORKER.ocr_reader_factory = ocr_reader_factory
+    _OCR_WORKER.load_ocr_model()
+
+
+def _ocr_worker_ready():
+    """No-op task that makes the pool start a worker (and load its reader) ahead of the first image"""
+    return _OCR_WORKER is not None
+
+
+def _ocr_worker_extract(record):
+    """Run OCR for one ImageRecord inside a worker process; returns (text, outcome, seconds)"""
+    if _OCR_WORKER.ocr_reader is None:
+        return "", None, None
+    start = time.perf_counter()
+    text, outcome = _OCR_WORKER.run_ocr(record)
+    return text, outcome, time.perf_counter() - start
+
+
+class ResultCache:
+    """
+    Persistent cache of analysis results, keyed by image content
+
+    Stores the OCR text, CLIP prediction and final category for every image
+    that went through the models. A byte-identical screenshot seen again
+    (copy-mode re-runs, files re-synced from a phone, duplicates) is answered
+    from the cache without running OCR or CLIP.
+
+    Entries are keyed by a BLAKE2 hash of the file bytes plus a fingerprint
+    of the model and config settings that influence the result, so changing
+    categories or models never returns stale answers. The least recently
+    used entries are evicted once the cache grows past max_entries.
+    """
+
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, db_path, fingerprint, max_entries=100000):
+        self.db_path = Path(db_path)
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts_since_eviction = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                content_hash TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                ocr_text TEXT NOT NULL,
+                clip_category TEXT,
+                clip_confidence REAL NOT NULL,
+                category TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, fingerprint)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self._conn.commit()
+
+    @classmethod
+    def content_hash(cls, image_path):
+        """Fast hash of the file bytes (BLAKE2b, 128-bit)"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_bytes(data):
+        """Same hash as content_hash, for bytes that are already in memory"""
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def contains(self, content_hash):
+        """Check for an entry without touching the hit/miss counters"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM results WHERE content_hash = ? AND fingerprint = ?",
+                (content_hash, self.fingerprint)
+            ).fetchone()
+        return row is not None
+
+    def get(self, content_hash):
+        """Return the cached result dict for content_hash, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ocr_text, clip_category, clip_confidence, category FROM results "
+                "WHERE content_hash = ? AND fingerprint = ?",
+                (content_hash, self.fingerprint)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE results SET last_used = ? WHERE content_hash = ? AND fingerprint = ?",
+                (time.time(), content_hash, self.fingerprint)
+            )
+            self._conn.commit()
+
+        return {
+            'ocr_text': row[0],
+            'clip_category': row[1],
+            'clip_confidence': row[2],
+            'category': row[3]
+        }
+
+    def put(self, content_hash, ocr_text, clip_category, clip_confidence, category):
+        """Store the analysis result for content_hash"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, self.fingerprint, ocr_text, clip_category,
+                 clip_confidence, category, time.time())
+            )
+            self._conn.commit()
+
+            self._puts_since_eviction += 1
+            if self._puts_since_eviction >= 100:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries (caller holds the lock)"""
+        self._puts_since_eviction = 0
+        count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY last_used ASC LIMIT ?)",
+                (excess,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over 64-bit hashes, using Hamming distance
+
+    Every child edge is labelled with its distance to the parent. By the
+    triangle inequality, a search for hashes within k of a query only has to
+    follow edges labelled d-k..d+k (d = distance to the current node), so
+    lookups touch a small part of the tree even with many thousands of hashes.
+    """
+
+    def __init__(self):
+        self.root = None  # [hash, {distance: child}]
+        self.size = 0
+
+    @staticmethod
+    def distance(a, b):
+        return bin(a ^ b).count('1')
+
+    def add(self, key):
+        """Insert key (no-op if it's already in the tree)"""
+        node = [key, {}]
+        if self.root is None:
+            self.root = node
+            self.size += 1
+            return
+
+        current = self.root
+        while True:
+            distance = self.distance(current[0], key)
+            if distance == 0:
+                return
+            child = current[1].get(distance)
+            if child is None:
+                current[1][distance] = node
+                self.size += 1
+                return
+            current = child
+
+    def nearest(self, key, max_distance):
+        """(distance, key) of the closest stored key within max_distance, or None"""
+        best = None
+        stack = [self.root] if self.root else []
+        while stack:
+            node_key, children = stack.pop()
+            distance = self.distance(node_key, key)
+            if distance <= max_distance and (best is None or distance < best[0]):
+                best = (distance, node_key)
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return best
+
+
+class NearDuplicateIndex:
+    """
+    Persistent index of perceptual hashes of analyzed images
+
+    Every image that went through the models is stored with its dHash,
+    category and OCR text in a small SQLite file. Only the hashes are kept
+    in memory (as a BKTree, a few dozen bytes each); the rest is read from
+    SQLite on a match. A new screenshot whose hash is within a few bits of a known one
+    (the same screen captured again) reuses that result instead of running
+    OCR and CLIP. Like ResultCache, entries carry the settings fingerprint,
+    so changing categories or models starts a fresh index.
+    """
+
+    def __init__(self, db_path, fingerprint):
+        self.db_path = Path(db_path)
+        self.fingerprint = fingerprint
+        self.tree = BKTree()
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS hashes (
+                dhash TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                content_hash TEXT,
+                category TEXT NOT NULL,
+                ocr_text TEXT NOT NULL,
+                source TEXT NOT NULL,
+                PRIMARY KEY (dhash, fingerprint)
+            )
+        """)
+        self._conn.commit()
+
+        rows = self._conn.execute("SELECT dhash FROM hashes WHERE fingerprint = ?", (fingerprint,))
+        for (dhash,) in rows:
+            self.tree.add(int(dhash, 16))
+
+    def find(self, dhash, max_distance):
+        """Entry dict (plus 'distance') of the closest indexed image, or None"""
+        with self._lock:
+            match = self.tree.nearest(dhash, max_distance)
+            if match is None:
+                return None
+            row = self._conn.execute(
+                "SELECT content_hash, category, ocr_text, source FROM hashes WHERE dhash = ? AND fingerprint = ?",
+                (f"{match[1]:016x}", self.fingerprint)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'content_hash': row[0], 'category': row[1], 'ocr_text': row[2],
+                'source': row[3], 'distance': match[0]}
+
+    def add(self, dhash, content_hash, category, ocr_text, source):
+        """Index an analyzed image"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                (f"{dhash:016x}", self.fingerprint, content_hash, category, ocr_text, source)
+            )
+            self._conn.commit()
+            self.tree.add(dhash)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingIndex:
+    """
+    On-disk CLIP image embeddings of the organized library, for search and re-classification
+
+    Every image CLIP looks at has its L2-normalized image embedding appended
+    as a float16 row to a flat vectors file (1 KB per image for ViT-B/32).
+    A SQLite table maps row numbers to the content hash, where the file was
+    placed, its category and OCR text. Searching memory-maps the vectors
+    and scores them with one matrix product per chunk, so 100k+ images
+    take milliseconds without ever sitting in RAM. Because the embeddings
+    and OCR text are kept, categories can be re-assigned for a changed
+    config without running the models again (see category_probabilities).
+
+    An image that is already indexed (same content hash) only gets its
+    path and category updated. Images placed without running CLIP (result
+    cache hits, near-duplicates, an OCR-only cascade) are kept in a pending
+    table with their OCR text until their embedding is computed (see
+    add_pending). Vectors are written before their table row;
+    on open, the two are cut back to the rows both have, so a crash can't
+    leave them out of step.
+
+    Several processes may write to one index (a watch daemon next to a
+    one-off run share the cache folder). Writers hold an exclusive lock on
+    the .lock file while appending, and take the next row number from the
+    table under that lock rather than from what they read at open.
+    """
+
+    # Rows scored per matrix product, bounds the working copy
+    CHUNK_ROWS = 16384
+
+    def __init__(self, base_path):
+        self.vectors_path = Path(f"{base_path}.f16")
+        self.db_path = Path(f"{base_path}.sqlite3")
+        self.lock_path = Path(f"{base_path}.lock")
+        self._vectors_file = None
+        self._lock_file = None
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS images (
+                row INTEGER PRIMARY KEY,
+                content_hash TEXT UNIQUE,
+                path TEXT NOT NULL,
+                category TEXT,
+                ocr_text TEXT NOT NULL,
+                added REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pending (
+                content_hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                category TEXT,
+                ocr_text TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+        self._acquire()
+        try:
+            self._sync()
+        finally:
+            self._release()
+
+    def _acquire(self):
+        """Exclusive lock across processes (flock, or msvcrt on Windows); blocks while another writer holds it"""
+        if self._lock_file is None:
+            self._lock_file = open(self.lock_path, 'a+b')
+        try:
+            import fcntl
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            self._lock_file.seek(0)
+            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _release(self):
+        try:
+            import fcntl
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+            self._lock_file.seek(0)
+            msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _sync(self):
+        """Under the lock: catch up with rows other processes added, then settle"""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self.dim = int(row[0]) if row else None
+        self.count = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM images").fetchone()[0]
+        self._settle()
+
+    def _settle(self):
+        """Cut the vectors file and the table back to the rows both have"""
+        row_bytes = self.dim * 2 if self.dim else 0
+        size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+        stored = size // row_bytes if row_bytes else 0
+        if stored < self.count:
+            self._conn.execute("DELETE FROM images WHERE row >= ?", (stored,))
+            self._conn.commit()
+            self.count = stored
+        if size != self.count * row_bytes:
+            with open(self.vectors_path, 'r+b') as f:
+                f.truncate(self.count * row_bytes)
+
+    def add(self, vector, content_hash, path, category, ocr_text):
+        """Index an image's embedding, or refresh path/category if its content is already indexed"""
+        import numpy as np
+
+        vector = np.asarray(vector, dtype=np.float16).ravel()
+        with self._lock:
+            self._acquire()
+            try:
+                self._sync()
+                if content_hash is not None and self._update(content_hash, path, category, ocr_text):
+                    return
+                if self.dim is None:
+                    self.dim = len(vector)
+                    self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+                elif len(vector) != self.dim:
+                    raise ValueError(f"embedding has {len(vector)} dimensions, the index {self.dim}")
+
+                self._append(vector.tobytes(), [
+                    (self.count, content_hash, os.fspath(path), category, ocr_text, time.time())
+                ])
+            finally:
+                self._release()
+
+    def _append(self, data, rows):
+        """Append vectors and their table rows (under the lock); on failure neither is kept"""
+        if self._vectors_file is None:
+            self._vectors_file = open(self.vectors_path, 'ab')
+        try:
+            self._vectors_file.write(data)
+            self._vectors_file.flush()
+            self._conn.executemany("INSERT INTO images VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany("DELETE FROM pending WHERE content_hash = ?",
+                                   [(row[1],) for row in rows if row[1] is not None])
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            self._settle()
+            raise
+        self.count += len(rows)
+
+    def update(self, content_hash, path, category, ocr_text=None):
+        """Record where an indexed image went now (e.g. a cached re-run); False if it isn't indexed"""
+        with self._lock:
+            return self._update(content_hash, path, category, ocr_text)
+
+    def _update(self, content_hash, path, category, ocr_text):
+        cursor = self._conn.execute(
+            "UPDATE images SET path = ?, category = ?, ocr_text = COALESCE(?, ocr_text) WHERE content_hash = ?",
+            (os.fspath(path), category, ocr_text, content_hash)
+        )
+        self._conn.commit()
+        return cursor.rowcount > 0
+
+    def add_pending(self, content_hash, path, category, ocr_text):
+        """Note an image that was placed without an embedding; --reclassify computes it later"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO pending VALUES (?, ?, ?, ?)",
+                               (content_hash, os.fspath(path), category, ocr_text or ""))
+            self._conn.commit()
+
+    def pending(self):
+        """Images waiting for their embedding, as dicts (content_hash, path, category, ocr_text)"""
+        with self._lock:
+            found = self._conn.execute("SELECT content_hash, path, category, ocr_text FROM pending").fetchall()
+        return [{'content_hash': content_hash, 'path': path, 'category': category, 'ocr_text': ocr_text}
+                for content_hash, path, category, ocr_text in found]
+
+    def drop_pending(self, content_hashes):
+        with self._lock:
+            self._conn.executemany("DELETE FROM pending WHERE content_hash = ?",
+                                   [(content_hash,) for content_hash in content_hashes])
+            self._conn.commit()
+
+    def entry(self, row):
+        """Metadata dict of one row"""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT content_hash, path, category, ocr_text FROM images WHERE row = ?", (row,)
+            ).fetchone()
+        return {'row': row, 'content_hash': found[0], 'path': found[1],
+                'category': found[2], 'ocr_text': found[3]}
+
+    def entries(self):
+        """Metadata dicts of all rows, in row order (matches vectors())"""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT row, content_hash, path, category, ocr_text FROM images WHERE row < ? ORDER BY row",
+                (self.count,)
+            ).fetchall()
+        return [{'row': row, 'content_hash': content_hash, 'path': path, 'category': category,
+                 'ocr_text': ocr_text} for row, content_hash, path, category, ocr_text in found]
+
+    def find(self, content_hash):
+        """Row number of an indexed image content, or None"""
+        with self._lock:
+            found = self._conn.execute("SELECT row FROM images WHERE content_hash = ?", (content_hash,)).fetchone()
+        return found[0] if found else None
+
+    def vectors(self):
+        """All embeddings as a (count, dim) float16 memory map (copy-on-write, the file is never changed)"""
+        import numpy as np
+
+        with self._lock:
+            count = self.count
+        if not count:
+            return np.zeros((0, self.dim or 0), dtype=np.float16)
+        return np.memmap(self.vectors_path, dtype=np.float16, mode='c', shape=(count, self.dim))
+
+    def _similarities(self, vectors, queries):
+        """
+        vectors @ queries.T as float32, CHUNK_ROWS rows at a time
+
+        Uses torch's float16 kernels when torch is already loaded (several
+        times faster than converting every row to float32 with numpy), and
+        numpy otherwise, so a lookup doesn't pay for importing torch.
+        """
+        import numpy as np
+
+        queries = np.asarray(queries, dtype=np.float32)
+        result = np.empty((len(vectors),) + queries.shape[:-1], dtype=np.float32)
+        torch = sys.modules.get('torch')
+        for start in range(0, len(vectors), self.CHUNK_ROWS):
+            block = vectors[start:start + self.CHUNK_ROWS]
+            if torch is not None:
+                scores = (torch.from_numpy(block) @ torch.from_numpy(queries.T).half()).float().numpy()
+            else:
+                scores = np.asarray(block, dtype=np.float32) @ queries.T
+            result[start:start + len(block)] = scores
+        return result
+
+    def search(self, query, top_k=10, exclude_row=None):
+        """
+        The top_k rows most similar to query (a normalized embedding)
+
+        Returns entry dicts with their cosine similarity as 'score', best first.
+        """
+        import numpy as np
+
+        vectors = self.vectors()
+        if not len(vectors):
+            return []
+        scores = self._similarities(vectors, np.asarray(query, dtype=np.float32).ravel())
+        if exclude_row is not None:
+            scores[exclude_row] = -np.inf
+
+        top_k = max(0, min(top_k, len(scores) - (exclude_row is not None)))
+        if not top_k:
+            return []
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [dict(self.entry(int(row)), score=float(scores[row])) for row in best]
+
+    def category_probabilities(self, category_embeddings, logit_scale):
+        """
+        CLIP category probabilities for every indexed image, from the stored embeddings
+
+        category_embeddings is a (categories, dim) array of normalized text
+        embeddings (see build_category_embeddings). Returns a (count,
+        categories) float32 array - the same softmax classify_with_clip
+        computes, without running the image tower again.
+        """
+        import numpy as np
+
+        logits = logit_scale * self._similarities(self.vectors(), category_embeddings)
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities
+
+    def merge(self, other):
+        """
+        Add every row of another index (e.g. one shard's, see ShardLeases)
+
+        Images this index already has only get their path and category
+        updated, and pending images are carried over. Written in one
+        transaction; returns the number of rows added.
+        """
+        import numpy as np
+
+        entries = other.entries()
+        vectors = other.vectors()
+        with self._lock:
+            self._acquire()
+            try:
+                self._sync()
+                if self.dim is None and other.dim is not None:
+                    self.dim = other.dim
+                    self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('dim', ?)", (str(self.dim),))
+                elif entries and other.dim != self.dim:
+                    raise ValueError(f"embeddings have {other.dim} dimensions, the index {self.dim}")
+
+                new_rows = []
+                for entry in entries:
+                    if entry['content_hash'] is not None and self._conn.execute(
+                        "UPDATE images SET path = ?, category = ?, ocr_text = ? WHERE content_hash = ?",
+                        (entry['path'], entry['category'], entry['ocr_text'], entry['content_hash'])
+                    ).rowcount:
+                        continue
+                    new_rows.append(entry)
+
+                for entry in other.pending():
+                    if not self._conn.execute("SELECT 1 FROM images WHERE content_hash = ?",
+                                              (entry['content_hash'],)).fetchone():
+                        self._conn.execute("INSERT OR REPLACE INTO pending VALUES (?, ?, ?, ?)",
+                                           (entry['content_hash'], entry['path'], entry['category'],
+                                            entry['ocr_text']))
+
+                if new_rows:
+                    block = np.asarray(vectors[[entry['row'] for entry in new_rows]], dtype=np.float16)
+                    self._append(block.tobytes(), [
+                        (self.count + i, entry['content_hash'], entry['path'], entry['category'],
+                         entry['ocr_text'], time.time()) for i, entry in enumerate(new_rows)
+                    ])
+                else:
+                    self._conn.commit()
+            finally:
+                self._release()
+        return len(new_rows)
+
+    def close(self):
+        with self._lock:
+            if self._vectors_file:
+                self._vectors_file.close()
+                self._vectors_file = None
+            if self._lock_file:
+                self._lock_file.close()
+                self._lock_file = None
+            self._conn.close()
+
+
+class Journal:
+    """
+    Append-only, crash-safe log of the file operations of one run
+
+    One JSON object per line. Before an image is moved or copied an
+    'intent' line (source, destination, category) is written and fsync'ed;
+    a 'done' line follows once the operation returned. Replaying the file
+    tells a resumed run which images are finished, and recover() settles
+    every intent that has no done line:
+
+    - source gone, destination there: the move finished -> completed
+    - source still there: the operation may be half done -> a partial
+      destination is deleted (rolled back) and the image is organized again
+    - both gone: the file disappeared -> forgotten
+
+    An operation that failed is closed with an 'abort' line, so its
+    destination name can be reused. Recovery only deletes a destination that
+    no done line claims and that is the size of the source; anything else
+    belongs to another image and is left alone.
+
+    Done lines are not fsync'ed; losing one only means recovery checks that
+    file again. A torn last line from a crash is ignored.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.done = {}  # absolute source path -> its 'done' entry
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open(self, resume=False):
+        """
+        Start a fresh journal, or replay and recover the existing one
+
+        Returns (completed, rolled_back): how many unfinished operations
+        recovery completed and undid.
+        """
+        pending = {}
+        if resume and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get('op') == 'intent':
+                        pending[entry['source']] = entry
+                    elif entry.get('op') == 'done':
+                        pending.pop(entry['source'], None)
+                        self.done[entry['source']] = entry
+                    elif entry.get('op') == 'abort':
+                        if pending.get(entry['source'], {}).get('destination') == entry['destination']:
+                            del pending[entry['source']]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if pending or self.done else 'w', encoding='utf-8')
+        if self._file.tell() > 0:
+            # Start on a fresh line in case the last write was torn
+            self._file.write('\n')
+
+        claimed = {entry['destination'] for entry in self.done.values()}
+        completed, rolled_back = 0, 0
+        for entry in pending.values():
+            if self._recover(entry, claimed):
+                completed += 1
+            else:
+                rolled_back += 1
+        self._sync()
+        return completed, rolled_back
+
+    def _recover(self, entry, claimed):
+        """Settle one unfinished operation; True if it turned out complete"""
+        source, destination = entry['source'], entry['destination']
+        if not os.path.exists(source):
+            if os.path.exists(destination) and destination not in claimed:
+                self.done[source] = dict(entry, op='done')
+                self._write(self.done[source])
+                return True
+            return False
+
+        # A claimed or differently sized file at the destination is another
+        # image's - deleting it would lose that image for good
+        try:
+            if destination not in claimed and os.path.getsize(destination) == os.path.getsize(source):
+                os.remove(destination)
+        except FileNotFoundError:
+            pass
+        return False
+
+    def is_done(self, image_path):
+        """True if image_path was organized by the journaled run and hasn't changed since"""
+        entry = self.done.get(os.path.abspath(image_path))
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return False
+        return stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']
+
+    def intent(self, image_path, destination, category, stat):
+        """Durably record an operation that is about to start"""
+        entry = {'op': 'intent', 'source': os.path.abspath(image_path),
+                 'destination': os.path.abspath(destination), 'category': category,
+                 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        with self._lock:
+            self._write(entry)
+            self._sync()
+        return entry
+
+    def complete(self, entry):
+        """Record that the operation started by intent() finished"""
+        entry = dict(entry, op='done')
+        with self._lock:
+            self._write(entry)
+            self.done[entry['source']] = entry
+
+    def abort(self, entry):
+        """Record that the operation started by intent() failed"""
+        with self._lock:
+            self._write({'op': 'abort', 'source': entry['source'], 'destination': entry['destination']})
+            self._sync()
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry) + '\n')
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, remove=False):
+        """Close the journal; remove=True deletes it after a finished run"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        if remove:
+            self.path.unlink(missing_ok=True)
+
+
+class ShardLeases:
+    """
+    Splits one shared source folder between several processes or hosts (--shard i/N)
+
+    Every image belongs to exactly one shard, picked by a stable hash of
+    its path relative to the source folder - hosts that mount the archive
+    in different places still agree. On top of that an image is only
+    organized once its lease file was created exclusively (O_EXCL, atomic
+    on local filesystems and NFSv3+) in the shared shard folder, so two
+    processes started for the same shard, or a restarted one, never
+    handle the same image:
+
+    - leases/ab/<hash>.lease - claimed, being organized (host, pid, time)
+    - leases/ab/<hash>.done  - organized, skipped from then on
+
+    An image that fails gives its lease back. The lease of a process that
+    died is taken over: right away on the same host (its pid is gone), from
+    other hosts once it's older than shard_lease_minutes.
+
+    Each run writes a report with its statistics and raw metrics next to
+    the leases; --merge-shards combines them into one summary.
+    """
+
+    def __init__(self, folder, source, shard, shard_count, lease_seconds):
+        import socket
+
+        self.folder = Path(folder)
+        self.source = os.path.abspath(source)
+        self.shard = shard
+        self.shard_count = shard_count
+        self.lease_seconds = lease_seconds
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.started = time.time()
+        self.run_id = f"{self.host}-{self.pid}-{int(self.started)}"
+        self.claimed = 0
+        self.held_elsewhere = 0
+        self.taken_over = 0
+        self._folders = set()
+        self._lock = threading.Lock()
+
+    def key(self, image_path):
+        """Stable hash of an image's path relative to the source folder"""
+        relative = os.path.relpath(os.path.abspath(image_path), self.source).replace(os.sep, '/')
+        return hashlib.sha1(relative.encode('utf-8')).hexdigest()
+
+    def owns(self, key):
+        return int(key[:16], 16) % self.shard_count == self.shard
+
+    def _lease_path(self, key, suffix):
+        folder = self.folder / 'leases' / key[:2]
+        with self._lock:
+            if folder not in self._folders:
+                folder.mkdir(parents=True, exist_ok=True)
+                self._folders.add(folder)
+        return folder / f"{key}{suffix}"
+
+    def claim_all(self, image_paths):
+        """Yield the images of this shard, each claimed just before it's handed on"""
+        for image_path in image_paths:
+            key = self.key(image_path)
+            if self.owns(key) and self.claim(key):
+                yield image_path
+
+    def claim(self, key):
+        """Take the lease of one image; False if it's done or another live process holds it"""
+        lease = self._lease_path(key, '.lease')
+        done = lease.with_suffix('.done')
+        if done.exists():
+            return False
+
+        if not self._create(lease):
+            if not self._take_over(lease):
+                with self._lock:
+                    self.held_elsewhere += 1
+                return False
+
+        if done.exists():
+            # Finished by another process between the check and the claim
+            lease.unlink(missing_ok=True)
+            return False
+        with self._lock:
+            self.claimed += 1
+        return True
+
+    def _create(self, lease):
+        try:
+            fd = os.open(lease, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'host': self.host, 'pid': self.pid, 'run': self.run_id, 'time': time.time()}, f)
+        return True
+
+    def _take_over(self, lease):
+        """Replace the lease of a dead process (see class docstring); True if it's ours now"""
+        try:
+            stat = lease.stat()
+            try:
+                holder = json.loads(lease.read_text(encoding='utf-8'))
+            except ValueError:
+                holder = {}  # still being written
+        except FileNotFoundError:
+            return self._create(lease)
+
+        dead = holder.get('host') == self.host and holder.get('pid') and not self._pid_alive(holder['pid'])
+        if not dead and time.time() - stat.st_mtime < self.lease_seconds:
+            return False
+
+        stale = lease.with_name(f"{lease.name}.{self.pid}.stale")
+        try:
+            os.rename(lease, stale)
+        except FileNotFoundError:
+            return self._create(lease)
+        if os.stat(stale).st_ino != stat.st_ino:
+            # Another process took it over first; that lease is fresh, put it back
+            try:
+                os.link(stale, lease)
+            except FileExistsError:
+                pass
+            os.unlink(stale)
+            return False
+        os.unlink(stale)
+
+        if not self._create(lease):
+            return False
+        with self._lock:
+            self.taken_over += 1
+        return True
+
+    @staticmethod
+    def _pid_alive(pid):
+        if os.name == 'nt':
+            # os.kill would terminate it; rely on the lease age there
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True
+        return True
+
+    def finish(self, result):
+        """on_result callback: mark a claimed image done, or give its lease back if it failed"""
+        lease = self._lease_path(self.key(result['source']), '.lease')
+        if result['status'] == 'ok':
+            try:
+                os.replace(lease, lease.with_suffix('.done'))
+            except FileNotFoundError:
+                lease.with_suffix('.done').touch()
+        else:
+            lease.unlink(missing_ok=True)
+
+    def write_report(self, stats, metrics_state, complete):
+        """Save this run's statistics and raw metrics for --merge-shards"""
+        report = {
+            'shard': self.shard,
+            'shard_count': self.shard_count,
+            'run': self.run_id,
+            'host': self.host,
+            'pid': self.pid,
+            'source': self.source,
+            'started': self.started,
+            'finished': time.time(),
+            'complete': complete,
+            'claimed': self.claimed,
+            'held_elsewhere': self.held_elsewhere,
+            'taken_over': self.taken_over,
+            'stats': stats,
+            'metrics': metrics_state,
         }
+        path = self.folder / f"shard-{self.shard}-of-{self.shard_count}.{self.run_id}.json"
+        temp_path = path.with_name(path.name + '.tmp')
+        self.folder.mkdir(parents=True, exist_ok=True)
+        temp_path.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        os.replace(temp_path, path)
+        return path
+
+    @staticmethod
+    def read_reports(folder):
+        """All run reports in a shard folder (unreadable ones are skipped)"""
+        reports = []
+        for path in sorted(Path(folder).glob('shard-*.json')):
+            try:
+                reports.append(json.loads(path.read_text(encoding='utf-8')))
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️  Skipping unreadable shard report {path.name}: {e}")
+        return reports
+
+
+class PlacementPlanner:
+    """
+    Picks unique destination paths and puts files there with as little work as possible
+
+    Placing files one by one the obvious way costs a mkdir per file and,
+    for names that repeat a lot (rename_files gives category_2025-12-05.png
+    to every unreadable screenshot of a day), an exists() probe per taken
+    name_1, name_2, ... - quadratic in the number of collisions. Instead:
+
+    - folders are created once and remembered
+    - every destination folder is listed with one scandir the first time it's
+      used; its file names and the next free counter per name are kept in
+      memory, so a unique name is found in O(1)
+    - moves on the same device are a plain os.rename; copies can be reflinks
+      (copy-on-write clones on btrfs/XFS/...) or hardlinks
+
+    A name is reserved the moment it's picked, so threads never collide.
+    Names are compared case-insensitively (safe on macOS/Windows), and each
+    pick is checked once on disk to catch files created by someone else.
+    When other processes place files into the same tree (--shard), set
+    exclusive: transfers then never replace an existing file and raise
+    FileExistsError instead, so the caller can pick the next name.
+    """
+
+    COPY_METHODS = ('copy', 'reflink', 'hardlink')
+
+    # Linux ioctl that clones a file's extents (the same as cp --reflink)
+    FICLONE = 0x40049409
+
+    def __init__(self, exclusive=False):
+        self.exclusive = exclusive
+        self._folders = {}  # absolute folder -> {'names', 'next', 'device'}
+        self._warned = set()
+        self._lock = threading.Lock()
+
+    def _index(self, folder):
+        """Name index for folder, creating and listing the folder on first use (lock held)"""
+        index = self._folders.get(folder)
+        if index is None:
+            os.makedirs(folder, exist_ok=True)
+            with os.scandir(folder) as entries:
+                names = {entry.name.lower() for entry in entries}
+            index = self._folders[folder] = {'names': names, 'next': {}, 'device': os.stat(folder).st_dev}
+        return index
+
+    def reserve(self, folder, filename):
+        """Pick a free name for filename in folder (name, name_1, ...), reserve it and return the path"""
+        folder = os.fspath(folder)
+        stem, ext = os.path.splitext(filename)
+        key = filename.lower()
+
+        with self._lock:
+            index = self._index(os.path.abspath(folder))
+            names = index['names']
+
+            def taken(name):
+                if name.lower() in names:
+                    return True
+                if os.path.lexists(os.path.join(folder, name)):
+                    names.add(name.lower())
+                    return True
+                return False
+
+            candidate, counter = filename, index['next'].get(key, 1)
+            while taken(candidate):
+                candidate = f"{stem}_{counter}{ext}"
+                counter += 1
+            if candidate != filename:
+                index['next'][key] = counter
+            names.add(candidate.lower())
+        return os.path.join(folder, candidate)
+
+    def release(self, path):
+        """Give back a reserved name whose file was never created"""
+        folder, name = os.path.split(os.path.abspath(path))
+        with self._lock:
+            index = self._folders.get(folder)
+            if index:
+                index['names'].discard(name.lower())
+
+    def forget(self, folder):
+        """Drop what's known about folder (e.g. it was deleted); it's re-listed on next use"""
+        with self._lock:
+            self._folders.pop(os.path.abspath(folder), None)
+
+    def transfer(self, source, destination, method, source_stat=None):
+        """
+        Put source at the reserved destination
+
+        method is 'move' or one of COPY_METHODS. A move within one device
+        is a single rename; across devices it's copy + delete. reflink and
+        hardlink fall back to a normal copy (with a warning, once) where the
+        filesystem can't do them.
+        """
+        if method == 'move':
+            index = self._folders.get(os.path.dirname(os.path.abspath(destination)))
+            same_device = source_stat is not None and index and source_stat.st_dev == index['device']
+            if not self.exclusive:
+                if same_device:
+                    os.rename(source, destination)
+                else:
+                    shutil.move(source, destination)
+                return
+            # rename() silently replaces an existing file, link() refuses to
+            if same_device:
+                try:
+                    os.link(source, destination)
+                    os.unlink(source)
+                    return
+                except FileExistsError:
+                    raise
+                except OSError as e:
+                    self._fall_back(method, e)
+            self._copy(source, destination)
+            os.unlink(source)
+            return
+
+        if method == 'hardlink':
+            try:
+                os.link(source, destination)
+                return
+            except FileExistsError:
+                raise
+            except OSError as e:
+                self._fall_back(method, e)
+        elif method == 'reflink':
+            try:
+                self._reflink(source, destination)
+                return
+            except FileExistsError:
+                raise
+            except (OSError, ImportError) as e:
+                self._fall_back(method, e)
+        self._copy(source, destination)
+
+    def _copy(self, source, destination):
+        """Plain copy with metadata; with exclusive, fails instead of overwriting"""
+        if not self.exclusive:
+            shutil.copy2(source, destination)
+            return
+        with open(source, 'rb') as src, open(destination, 'xb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        shutil.copystat(source, destination)
+
+    def _reflink(self, source, destination):
+        """Copy-on-write clone of source (Linux); raises OSError where unsupported"""
+        import fcntl
+
+        with open(source, 'rb') as src, open(destination, 'xb') as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+            except OSError:
+                dst.close()
+                os.remove(destination)
+                raise
+        shutil.copystat(source, destination)
+
+    def _fall_back(self, method, error):
+        with self._lock:
+            if method in self._warned:
+                return
+            self._warned.add(method)
+        if method == 'move':
+            print(f"  ⚠️  Can't move without overwriting by hardlink here ({error}), copying + deleting instead")
+        else:
+            print(f"  ⚠️  copy_method '{method}' isn't possible here ({error}), copying instead")
+
+
+class WatchScheduler:
+    """
+    Decides which queued file watch mode organizes next
+
+    A folder that suddenly receives thousands of files (a phone sync, an
+    unzipped archive) shouldn't keep a screenshot taken a second later
+    waiting for minutes. Ready files go into one of two lanes:
+
+    - fast lane: new files from a folder that's otherwise quiet, i.e.
+      screenshots as they're taken. At most watch_fast_lane_size files.
+    - bulk lane: files from a folder that received more than
+      watch_fast_lane_size files within BURST_SECONDS, and whatever
+      doesn't fit into the fast lane.
+
+    The fast lane always goes first. Within a lane, files from folders with
+    a higher watch_priorities value go first, then the newest (or oldest,
+    see watch_order) by modification time.
+
+    The bulk lane only gets a limited number of files in progress at a
+    time, so a file landing in the fast lane waits for little work:
+    no more than fits into the latency target at the measured speed per
+    image, halved whenever a fast-lane file came close to missing the
+    target and raised again by one per limit's worth of bulk files.
+
+    Per-lane wait (ready -> started) and latency (ready -> organized) are
+    recorded as metrics stages, queue depths as gauges. finished() is
+    called from pipeline threads, so all state is kept under a lock.
+    """
+
+    BURST_SECONDS = 1.0
+    # Share of the latency target from which a fast-lane file counts as at risk
+    AT_RISK = 0.8
+
+    def __init__(self, config, metrics, max_in_flight):
+        import collections
+
+        self.metrics = metrics
+        self.target = float(config['watch_latency_target_seconds'])
+        self.fast_lane_size = max(1, int(config['watch_fast_lane_size']))
+        self.newest_first = config['watch_order'] != 'oldest'
+        self.priorities = sorted(((os.path.realpath(os.path.expanduser(folder)), int(priority))
+                                  for folder, priority in config['watch_priorities'].items()),
+                                 key=lambda item: len(item[0]), reverse=True)
+        self.max_in_flight = max(1, max_in_flight)
+
+        self.lanes = {'fast': [], 'bulk': []}  # heaps of (-priority, age order, seq, path)
+        self.entries = {}  # path -> (lane, ready time, heap item), while queued or in progress
+        self.started = set()  # taken by take()/stream() and not finished yet
+        self.in_flight = {'fast': 0, 'bulk': 0}
+        self.max_depth = {'fast': 0, 'bulk': 0}
+        self.bulk_limit = float(self.max_in_flight)
+        self.per_image = None  # moving average of seconds between finished files while busy
+        self.fast_done = 0
+        self.fast_on_target = 0
+        self._arrivals = collections.defaultdict(collections.deque)  # folder -> recent arrival times
+        self._last_finished = 0.0
+        self._seq = 0
+        self._changed = threading.Condition()
+
+    def _priority(self, path):
+        folder = os.path.realpath(os.path.dirname(path))
+        for prefix, priority in self.priorities:
+            if folder == prefix or folder.startswith(prefix + os.sep):
+                return priority
+        return 0
+
+    def add(self, paths):
+        """Queue files that are ready; returns how many went into the fast and the bulk lane"""
+        import heapq
+
+        added = {'fast': 0, 'bulk': 0}
+        now = time.monotonic()
+        with self._changed:
+            for path in paths:
+                if path in self.entries:
+                    continue
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+
+                arrivals = self._arrivals[os.path.dirname(path)]
+                arrivals.append(now)
+                while arrivals[0] < now - self.BURST_SECONDS:
+                    arrivals.popleft()
+                quiet = len(arrivals) <= self.fast_lane_size
+                lane = 'fast' if quiet and len(self.lanes['fast']) < self.fast_lane_size else 'bulk'
+
+                self._seq += 1
+                order = -mtime if self.newest_first else mtime
+                item = (-self._priority(path), order, self._seq, path)
+                heapq.heappush(self.lanes[lane], item)
+                self.entries[path] = (lane, now, item)
+                added[lane] += 1
+            self._update_depth()
+            self._changed.notify_all()
+        return added['fast'], added['bulk']
+
+    def waiting(self):
+        """Number of queued files not started yet"""
+        with self._changed:
+            return len(self.lanes['fast']) + len(self.lanes['bulk'])
+
+    def _bulk_room(self):
+        """How many more bulk files may be started right now"""
+        limit = int(self.bulk_limit)
+        if self.per_image:
+            # Whatever is in progress has to finish before a new fast-lane file,
+            # which then needs its own per_image
+            limit = min(limit, int(self.target * self.AT_RISK / self.per_image) - 1)
+        return max(1, limit) - self.in_flight['bulk']
+
+    def _start(self, lane):
+        import heapq
+
+        path = heapq.heappop(self.lanes[lane])[3]
+        if not self.in_flight['fast'] + self.in_flight['bulk']:
+            # Speed is measured while busy; the time the queue sat empty doesn't count
+            self._last_finished = time.monotonic()
+        self.in_flight[lane] += 1
+        self.started.add(path)
+        self.metrics.record(f'queue_wait_{lane}', time.monotonic() - self.entries[path][1])
+        return path
+
+    def _update_depth(self):
+        for lane, queued in self.lanes.items():
+            self.max_depth[lane] = max(self.max_depth[lane], len(queued))
+            self.metrics.set_gauge(f'watch_queue_{lane}', len(queued))
+
+    def take(self):
+        """Next chunk for the serial path: the whole fast lane, otherwise as many bulk files as there's room for"""
+        with self._changed:
+            chunk = []
+            while self.lanes['fast'] and len(chunk) < self.max_in_flight:
+                chunk.append(self._start('fast'))
+            if not chunk:
+                for _ in range(min(len(self.lanes['bulk']), self._bulk_room())):
+                    chunk.append(self._start('bulk'))
+            self._update_depth()
+            return chunk
+
+    def stream(self, refill):
+        """
+        Files for the pipeline, one at a time, until the queue is empty
+
+        refill() is called before every pick so files that became ready in
+        the meantime are considered. Bulk files wait here while the bulk
+        lane is at its limit; fast-lane files never do.
+        """
+        while True:
+            refill()
+            with self._changed:
+                if self.lanes['fast']:
+                    path = self._start('fast')
+                elif self.lanes['bulk'] and self._bulk_room() > 0:
+                    path = self._start('bulk')
+                elif self.lanes['bulk']:
+                    self._changed.wait(0.05)
+                    continue
+                else:
+                    return
+                self._update_depth()
+            yield path
+
+    def finished(self, result):
+        """on_result callback: record the file's latency and adjust the bulk limit"""
+        now = time.monotonic()
+        with self._changed:
+            if result['source'] not in self.started:
+                return
+            self.started.discard(result['source'])
+            lane, ready, _ = self.entries.pop(result['source'])
+            self.in_flight[lane] -= 1
+
+            interval = now - self._last_finished
+            self.per_image = interval if self.per_image is None else 0.8 * self.per_image + 0.2 * interval
+            self._last_finished = now
+
+            latency = now - ready
+            self.metrics.record(f'latency_{lane}', latency)
+            if lane == 'fast':
+                self.fast_done += 1
+                self.fast_on_target += latency <= self.target
+                if latency > self.target * self.AT_RISK:
+                    self.bulk_limit = max(1.0, self.bulk_limit / 2)
+            else:
+                self.bulk_limit = min(float(self.max_in_flight), self.bulk_limit + 1 / self.bulk_limit)
+            self._changed.notify_all()
+
+    def requeue_unfinished(self):
+        """
+        Put files that were taken but never finished back at their place in the queue
+
+        Called after every organize call, so an error that ends it early
+        (models failed to load, an interrupted pipeline) doesn't leave the
+        files counted as in progress forever, which would stall the bulk lane.
+        Files that are gone in the meantime are dropped.
+        """
+        import heapq
+
+        with self._changed:
+            for path in self.started:
+                lane, _, item = self.entries[path]
+                self.in_flight[lane] -= 1
+                if os.path.isfile(path):
+                    heapq.heappush(self.lanes[lane], item)
+                else:
+                    del self.entries[path]
+            self.started.clear()
+            self._update_depth()
+            self._changed.notify_all()
+
+    def summary(self):
+        """Lines for print_summary"""
+        lines = [f"Watch queue: {len(self.lanes['fast'])} waiting in the fast lane (max {self.max_depth['fast']}), "
+                 f"{len(self.lanes['bulk'])} in the bulk lane (max {self.max_depth['bulk']})"]
+        if self.fast_done:
+            lines.append(f"Latency target {self.target:g}s met for {self.fast_on_target} of "
+                         f"{self.fast_done} fast-lane files; bulk lane limit now {int(self.bulk_limit)}")
+        return lines
+
+
+class LatencyHistogram:
+    """
+    Latency distribution in fixed logarithmic buckets
+
+    Each bucket is 10% wider than the previous one, starting at 10µs, so
+    memory stays constant however many samples are added and percentiles
+    are accurate to within one bucket (~10%).
+    """
+
+    MIN_SECONDS = 1e-5
+    GROWTH = 1.1
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds, count=1):
+        index = int(math.log(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS, self.GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += seconds * count
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.MIN_SECONDS * self.GROWTH ** (index + 1), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {'buckets': self.buckets, 'count': self.count, 'total': self.total, 'max': self.max}
+
+    def merge(self, state):
+        """Add the samples of another histogram, given as to_dict() (e.g. read back from JSON)"""
+        for index, count in state['buckets'].items():
+            index = int(index)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += state['count']
+        self.total += state['total']
+        self.max = max(self.max, state['max'])
+
+
+class Metrics:
+    """
+    Lightweight per-stage instrumentation for a run
+
+    Stages (read, decode, ocr, clip, keywords, place, ...) record their
+    duration per image into a LatencyHistogram; snapshot() turns them into
+    p50/p95/p99 plus throughput, bytes read and peak memory, ready to dump
+    as JSON or Prometheus text. Safe to use from pipeline threads.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.stages = {}
+        self.gauges = {}  # current values, e.g. watch queue depth
+        self.bytes_read = 0
+        self.started = time.monotonic()
+        self.first_result = None
+        # Set when combining shard reports (see merge): throughput is then
+        # measured over the whole job's wall time, memory is the largest shard's
+        self.wall_seconds = None
+        self.peak_rss = None
+        self._lock = threading.Lock()
+
+    def restart(self):
+        """Start the throughput clock (called when organizing begins)"""
+        self.started = time.monotonic()
+        self.first_result = None
+
+    def mark_result(self):
+        """Note the time to the first organized image (startup + first classification)"""
+        if self.first_result is None:
+            with self._lock:
+                if self.first_result is None:
+                    self.first_result = time.monotonic() - self.started
+
+    def record(self, stage, seconds, count=1):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.add(seconds, count)
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self.gauges[name] = value
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes_read += count
+
+    @staticmethod
+    def peak_rss_bytes():
+        """Peak resident memory of this process, or None where it can't be measured"""
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def state(self):
+        """Raw histograms and counters, JSON-friendly, for combining shards with merge()"""
+        with self._lock:
+            return {
+                'stages': {name: histogram.to_dict() for name, histogram in self.stages.items()},
+                'bytes_read': self.bytes_read,
+                'first_result_seconds': self.first_result,
+                'peak_rss_bytes': self.peak_rss_bytes(),
+            }
+
+    def merge(self, state):
+        """Add another process's state() - every stage's samples, bytes read, earliest first result"""
+        with self._lock:
+            for name, histogram in state['stages'].items():
+                self.stages.setdefault(name, LatencyHistogram()).merge(histogram)
+            self.bytes_read += state['bytes_read']
+            if state['first_result_seconds'] is not None:
+                self.first_result = min(self.first_result if self.first_result is not None else math.inf,
+                                        state['first_result_seconds'])
+            if state['peak_rss_bytes'] is not None:
+                self.peak_rss = max(self.peak_rss or 0, state['peak_rss_bytes'])
+
+    def snapshot(self, stats):
+        """
+        JSON-friendly dict of everything measured so far
+
+        Throughput leaves out the time spent blocked on model loading;
+        startup shows up as first_result_seconds instead. Merged shard
+        reports use the job's wall time (see merge).
+        """
+        elapsed = time.monotonic() - self.started
+        with self._lock:
+            waiting = self.stages.get('wait_for_models')
+            working = elapsed - (waiting.total if waiting else 0.0)
+            if self.wall_seconds is not None:
+                elapsed = working = self.wall_seconds
+            stages = {
+                name: {
+                    'count': histogram.count,
+                    'mean_seconds': histogram.total / histogram.count,
+                    **{f"p{int(q * 100)}_seconds": histogram.percentile(q) for q in self.QUANTILES},
+                    'max_seconds': histogram.max,
+                }
+                for name, histogram in self.stages.items() if histogram.count
+            }
+            bytes_read = self.bytes_read
+            gauges = dict(self.gauges)
+
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_seconds': elapsed,
+            'images_per_second': stats['processed'] / working if working > 0 else 0.0,
+            'first_result_seconds': self.first_result,
+            'bytes_read': bytes_read,
+            'peak_rss_bytes': self.peak_rss if self.peak_rss is not None else self.peak_rss_bytes(),
+            'stats': {key: value for key, value in stats.items() if key != 'categories'},
+            'categories': dict(stats['categories']),
+            'stages': stages,
+            'gauges': gauges,
+        }
+
+    @classmethod
+    def to_prometheus(cls, snapshot):
+        """Render a snapshot in the Prometheus text exposition format"""
+        prefix = 'screenshot_organizer'
+        lines = [
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, stage in sorted(snapshot['stages'].items()):
+            for q in cls.QUANTILES:
+                value = stage[f"p{int(q * 100)}_seconds"]
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stage["mean_seconds"] * stage["count"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+
+        lines.append(f"# TYPE {prefix}_images gauge")
+        for key, value in sorted(snapshot['stats'].items()):
+            lines.append(f'{prefix}_images{{counter="{key}"}} {value}')
+        lines.append(f"# TYPE {prefix}_category_images gauge")
+        for category, count in sorted(snapshot['categories'].items()):
+            escaped = category.replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'{prefix}_category_images{{category="{escaped}"}} {count}')
+
+        lines.append(f"# TYPE {prefix}_images_per_second gauge")
+        lines.append(f"{prefix}_images_per_second {snapshot['images_per_second']:.4f}")
+        if snapshot['first_result_seconds'] is not None:
+            lines.append(f"# TYPE {prefix}_first_result_seconds gauge")
+            lines.append(f"{prefix}_first_result_seconds {snapshot['first_result_seconds']:.4f}")
+        for name, value in sorted(snapshot.get('gauges', {}).items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        lines.append(f"# TYPE {prefix}_read_bytes_total counter")
+        lines.append(f"{prefix}_read_bytes_total {snapshot['bytes_read']}")
+        if snapshot['peak_rss_bytes'] is not None:
+            lines.append(f"# TYPE {prefix}_peak_rss_bytes gauge")
+            lines.append(f"{prefix}_peak_rss_bytes {snapshot['peak_rss_bytes']}")
+        return '\n'.join(lines) + '\n'
+
+
+class ScreenshotOrganizer:
+    def __init__(self, config_path='config.json'):
+        self.config_path = config_path
+        self.config = self.load_config(config_path)
+        self.stats = {
+            'total': 0,
+            'processed': 0,
+            'failed': 0,
+            'ocr_skipped': 0,
+            'ocr_no_regions': 0,
+            'near_duplicates': 0,
+            'cascade_ocr_only': 0,
+            'cascade_clip_only': 0,
+            'cascade_both': 0,
+            'cascade_audited': 0,
+            'cascade_audit_changed': 0,
+            'categories': {}
+        }
+
+        # Initialize models (lazy loading)
+        self.clip_model = None
+        self.clip_processor = None
+        self.ocr_reader = None
+        # Optional picklable callable that builds the OCR reader instead of
+        # EasyOCR (also in pipeline worker processes); used by the bench stubs
+        self.ocr_reader_factory = None
+        self.category_names = []
+        self.category_embeddings = None
+        self.clip_logit_scale = None
+        self.clip_backend = None
+        self.image_encoder = None
+        self.result_cache = None
+        self.near_duplicates = None
+        self.embedding_index = None
+        self.journal = None
+        self._keyword_matcher = None
+
+        # Background model loading (see start_model_loading) and model
+        # residency for long-running modes (see unload_models)
+        self.models_loaded = False
+        self._model_loaders = []
+        self._model_wait_lock = threading.Lock()
+        self._ocr_in_workers = False
+        self._last_activity = time.monotonic()
+        # Memory right after the models (re)loaded, and whether memory_limit_mb
+        # turned out to be below it (see after_batch)
+        self._loaded_rss = None
+        self._memory_limit_too_low = False
+        # OCR worker processes of the parallel pipeline, kept for the whole
+        # session (see ocr_worker_pool) and stopped by cleanup()
+        self._ocr_pool = None
+        self._ocr_pool_workers = 0
+
+        # Per-stage timings, throughput and memory (see Metrics)
+        self.metrics = Metrics()
+        self._metrics_written = 0.0
+
+        # Per-image model latency (moving average) and audit counter for the cascade
+        self.model_latency = {}
+        self._audit_counter = 0
+
+        # Shared state for the parallel pipeline (see organize_pipeline)
+        self._stats_lock = threading.Lock()
+
+        # Destination folders and file names already known (see PlacementPlanner)
+        self.placement = PlacementPlanner()
+
+        # (index, count) with --shard, and the leases of the running shard (see ShardLeases)
+        self.shard = None
+        self.leases = None
+
+        # Lanes and latency target of the watch-mode queue (see WatchScheduler)
+        self.watch_scheduler = None
+
+    def load_config(self, config_path):
+        """
+        Load configuration from file or use defaults
+
+        The config file allows you to customize:
+        - Categories and their keywords
+        - Source/destination folders
+        - File naming and organization preferences
+        """
+        default_config = {
+            'source_folder': '.',
+            'destination_folder': './Organized_Screenshots',
+            'categories': {
+                'Code': ['code', 'terminal', 'programming', 'script', 'console', 'editor'],
+                'Documents': ['document', 'text', 'pdf', 'article', 'paper'],
+                'Memes': ['meme', 'funny', 'comic', 'joke'],
+                'Chats': ['chat', 'message', 'conversation', 'whatsapp', 'telegram'],
+                'Design': ['design', 'ui', 'mockup', 'figma', 'sketch'],
+                'Diagrams': ['diagram', 'chart', 'graph', 'flowchart', 'architecture'],
+                'Receipts': ['receipt', 'bill', 'invoice', 'payment'],
+                'Errors': ['error', 'exception', 'traceback', 'warning', 'failed']
+            },
+            'organize_by_date': True,
+            'rename_files': True,
+            'move_or_copy': 'move',
+            'copy_method': 'copy',
+            'image_extensions': ['.png', '.jpg', '.jpeg', '.gif', '.bmp'],
+            'recursive': False,
+            'min_confidence': 0.3,
+            'clip_model': 'openai/clip-vit-base-patch32',
+            'clip_backend': 'torch',
+            'cache_folder': './.screenshot_cache',
+            'cache_text_embeddings': True,
+            'clip_batch_size': 16,
+            'result_cache': True,
+            'result_cache_max_entries': 100000,
+            'journal': True,
+            'embedding_index': True,
+            'near_duplicates': False,
+            'near_duplicate_distance': 4,
+            'near_duplicate_folder': '',
+            'workers': 1,
+            'watch_events': True,
+            'watch_debounce_seconds': 0.5,
+            'watch_interval': 5,
+            'watch_order': 'newest',
+            'watch_priorities': {},
+            'watch_fast_lane_size': 4,
+            'watch_latency_target_seconds': 5,
+            'socket_path': '~/.screenshot_organizer.sock',
+            'model_idle_unload_minutes': 0,
+            'memory_limit_mb': 0,
+            'ocr_enabled': True,
+            'ocr_text_gate': 'edges',
+            'ocr_text_gate_threshold': 0.05,
+            'ocr_max_side': 0,
+            'ocr_canvas_size': 2560,
+            'ocr_max_regions': 0,
+            'ocr_max_chars': 0,
+            'cascade': 'off',
+            'cascade_ocr_min_hits': 2,
+            'cascade_clip_confidence': 0.5,
+            'cascade_audit_rate': 0.0,
+            'metrics_file': '',
+            'metrics_format': 'json',
+            'metrics_interval': 10,
+            'shard_folder': '',
+            'shard_lease_minutes': 30
+        }
+
+        if os.path.exists(config_path):
+            with open(config_path, 'r') as f:
+                user_config = json.load(f)
+                default_config.update(user_config)
+
+        return default_config
+
+    def initialize_models(self, ocr=None):
+        """
+        Initialize CLIP and OCR models (lazy loading)
+
+        CLIP: Vision-language model that understands image content
+        OCR: Optical Character Recognition to extract text from images
+
+        Models are loaded only when needed (lazy loading) to save memory.
+        Blocks until both are ready; organize_once() uses start_model_loading()
+        instead, so startup overlaps with scanning and reading the first images.
+        ocr is passed on to start_model_loading().
+        """
+        self.start_model_loading(ocr)
+        self.wait_for_models()
+
+    # Heavy imports (torch, transformers, easyocr) run one at a time: they hold
+    # the GIL anyway, and concurrent imports of shared modules can deadlock
+    _model_import_lock = threading.Lock()
+
+    def start_model_loading(self, ocr=None):
+        """
+        Start loading CLIP and OCR in background threads and return right away
+
+        The imports take one loader at a time, the weights load side by side,
+        and meanwhile the caller scans the folder and reads, hashes and decodes
+        the first images. wait_for_models() blocks until the models are ready;
+        it's called just before the first image that actually needs a model,
+        so images answered by the caches are organized while loading goes on.
+
+        EasyOCR isn't imported at all when ocr_enabled is off. With ocr=False
+        it isn't loaded in this process either - the parallel pipeline runs
+        OCR in worker processes that load their own reader, and those start
+        loading right away (see ocr_worker_pool). ocr=None picks that from
+        workers: in this process for 1, in the workers otherwise.
+        """
+        if self.models_loaded or self._model_loaders:
+            return
+        if ocr is None:
+            ocr = self._workers() <= 1
+        print("🔄 Loading AI models...")
+
+        self.open_caches()
+
+        loaders = [('load_clip', self.load_clip_model)]
+        self._ocr_in_workers = False
+        if self.config['ocr_enabled']:
+            if ocr:
+                loaders.append(('load_ocr', self.load_ocr_model))
+            else:
+                self._ocr_in_workers = True
+                self.ocr_worker_pool(self._workers())
+        else:
+            print("  ⏭️  OCR disabled (ocr_enabled is off)")
+
+        for stage, load in loaders:
+            thread = threading.Thread(target=self._timed_load, args=(stage, load), name=stage)
+            thread.start()
+            self._model_loaders.append(thread)
+
+    def _timed_load(self, stage, load):
+        """Run one model loader (in its thread) and record how long it took"""
+        start = time.perf_counter()
+        try:
+            load()
+        except Exception as e:
+            print(f"  ⚠️  {stage} failed: {e}")
+        self.metrics.record(stage, time.perf_counter() - start)
+
+    def wait_for_models(self):
+        """
+        Block until the models started by start_model_loading() are ready
+
+        Returns immediately once they are. Exits if neither model could be
+        loaded (and no OCR workers will provide text either).
+        """
+        if self.models_loaded:
+            return
+        with self._model_wait_lock:
+            if self.models_loaded:
+                return
+            if not self._model_loaders:
+                self.start_model_loading()
+
+            start = time.perf_counter()
+            for thread in self._model_loaders:
+                thread.join()
+            self._model_loaders = []
+            self.metrics.record('wait_for_models', time.perf_counter() - start)
+
+            if not self.clip_model and not self.ocr_reader and not self._ocr_in_workers:
+                print("\n❌ No AI models loaded. Please install dependencies.")
+                sys.exit(1)
+            self.models_loaded = True
+            self._loaded_rss = self.current_rss_mb()
+
+    def load_clip_model(self):
+        """
+        Load CLIP and the category embeddings (sets clip_model to None on failure)
+
+        If the category embeddings are already in the cache, only the image
+        half of CLIP (vision tower + projection) is loaded: the text tower and
+        the tokenizer are only needed to encode the category prompts, and
+        leaving them out makes loading faster and the model smaller.
+        """
+        try:
+            # Load CLIP
+            with self._model_import_lock:
+                print("  📦 Loading CLIP model...")
+                start = time.perf_counter()
+                import torch
+                from transformers import (CLIPImageProcessor, CLIPModel, CLIPProcessor,
+                                          CLIPVisionModelWithProjection)
+            self.metrics.record('import_clip', time.perf_counter() - start)
+
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            model_name = self.config['clip_model']
+
+            image_only = self.load_cached_category_embeddings()
+            if image_only:
+                self.clip_model = self._load_clip_tower(CLIPVisionModelWithProjection, 'vision_config')
+                self.clip_processor = CLIPImageProcessor.from_pretrained(model_name)
+            else:
+                self.clip_model = CLIPModel.from_pretrained(model_name)
+                self.clip_processor = CLIPProcessor.from_pretrained(model_name)
+
+            # Move to GPU if available
+            self.clip_model.to(self.device)
+            self.clip_model.eval()
+            print(f"  ✅ CLIP loaded on {self.device}{' (image tower only)' if image_only else ''}")
+
+            # Encode the category prompts once for the whole run
+            if not image_only:
+                self.build_category_embeddings()
+
+        except Exception as e:
+            print(f"  ⚠️  CLIP loading failed: {e}")
+            print("  💡 Install with: pip install transformers torch pillow")
+            self.clip_model = None
+            return
+
+        self.load_clip_backend()
+
+    def _load_clip_tower(self, tower_class, config_name):
+        """
+        Load one half of CLIP (image or text tower + projection) from a full CLIP checkpoint
+
+        tower_class is CLIPVisionModelWithProjection or CLIPTextModelWithProjection,
+        config_name the matching 'vision_config' or 'text_config'.
+        """
+        from transformers import CLIPConfig
+        from transformers.utils import logging as transformers_logging
+
+        model_name = self.config['clip_model']
+        config = CLIPConfig.from_pretrained(model_name)
+        tower_config = getattr(config, config_name)
+        tower_config.projection_dim = config.projection_dim
+
+        # The other half's weights go unused on purpose - don't list them
+        verbosity = transformers_logging.get_verbosity()
+        transformers_logging.set_verbosity_error()
+        try:
+            return tower_class.from_pretrained(model_name, config=tower_config)
+        finally:
+            transformers_logging.set_verbosity(verbosity)
+
+    # Backends for the CLIP image tower (see load_clip_backend)
+    CLIP_BACKENDS = ('torch', 'torch_int8', 'onnx')
+
+    def load_clip_backend(self):
+        """
+        Set up the image encoder CLIP runs per screenshot
+
+        'torch' runs the model as loaded. The CPU-only alternatives are
+        usually faster on machines without a GPU:
+        - 'torch_int8': dynamic int8 quantization of the linear layers
+        - 'onnx': image tower exported once to cache_folder and run with
+          ONNX Runtime
+        Falls back to 'torch' (with a warning) if the backend can't be set up.
+        """
+        backend = self.config.get('clip_backend', 'torch')
+        if backend not in self.CLIP_BACKENDS:
+            print(f"  ⚠️  Unknown clip_backend '{backend}', using torch")
+            backend = 'torch'
+        if backend != 'torch' and self.device != 'cpu':
+            print(f"  ⚠️  clip_backend '{backend}' is CPU-only, using torch on {self.device}")
+            backend = 'torch'
+
+        tower = _clip_image_tower(self.clip_model)
+        try:
+            if backend == 'torch_int8':
+                self.image_encoder = self._int8_image_encoder(tower)
+            elif backend == 'onnx':
+                self.image_encoder = self._onnx_image_encoder(tower)
+        except Exception as e:
+            print(f"  ⚠️  clip_backend '{backend}' failed, using torch: {e}")
+            if backend == 'onnx':
+                print("  💡 Install with: pip install onnx onnxruntime")
+            backend = 'torch'
+
+        if backend == 'torch':
+            self.image_encoder = self._torch_image_encoder(tower)
+        else:
+            print(f"  ✅ CLIP image encoder: {backend}")
+        self.clip_backend = backend
+
+    @staticmethod
+    def _torch_image_encoder(tower):
+        """Encoder that runs a torch image tower without autograd"""
+        import torch
+
+        def encode(pixel_values):
+            with torch.no_grad():
+                return tower(pixel_values)
+
+        return encode
+
+    def _int8_image_encoder(self, tower):
+        """Encoder backed by a dynamically int8-quantized copy of the image tower"""
+        import torch
+
+        quantized = torch.ao.quantization.quantize_dynamic(tower, {torch.nn.Linear}, dtype=torch.qint8)
+        return self._torch_image_encoder(quantized)
+
+    def _onnx_model_path(self):
+        """Cache file for the exported image tower, keyed by model name and torch version"""
+        import torch
+
+        if not self.config.get('cache_folder'):
+            raise RuntimeError("the onnx backend needs cache_folder to store the exported model")
+
+        key = json.dumps({'model': self.config['clip_model'], 'torch': torch.__version__})
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return Path(self.config['cache_folder']) / f"clip_vision_{digest}.onnx"
+
+    def _onnx_image_encoder(self, tower):
+        """
+        Encoder backed by ONNX Runtime
+
+        The image tower is exported on first use (a few seconds) and the
+        .onnx file is reused by later runs with the same model
+        """
+        import numpy as np
+        import onnxruntime
+        import torch
+
+        model_path = self._onnx_model_path()
+        if not model_path.exists():
+            print("  📦 Exporting CLIP image tower to ONNX (first run only)...")
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            config = self.clip_model.config
+            size = getattr(config, 'vision_config', config).image_size
+            export_args = dict(
+                input_names=['pixel_values'],
+                output_names=['image_embeds'],
+                dynamic_axes={'pixel_values': {0: 'batch'}, 'image_embeds': {0: 'batch'}},
+                opset_version=17,
+            )
+            temp_path = model_path.with_name(model_path.name + '.tmp')
+            with torch.no_grad():
+                try:
+                    torch.onnx.export(tower, (torch.zeros(1, 3, size, size),), str(temp_path),
+                                      dynamo=False, **export_args)
+                except TypeError:
+                    # torch releases before the dynamo exporter have no dynamo argument
+                    torch.onnx.export(tower, (torch.zeros(1, 3, size, size),), str(temp_path),
+                                      **export_args)
+            os.replace(temp_path, model_path)
+
+        session = onnxruntime.InferenceSession(str(model_path), providers=['CPUExecutionProvider'])
+
+        def encode(pixel_values):
+            inputs = {'pixel_values': pixel_values.numpy().astype(np.float32)}
+            return torch.from_numpy(session.run(None, inputs)[0])
+
+        return encode
+
+    def load_ocr_model(self):
+        """Load the EasyOCR reader (sets ocr_reader to None on failure)"""
+        if self.ocr_reader_factory:
+            self.ocr_reader = self.ocr_reader_factory()
+            print("  ✅ OCR loaded (custom reader)")
+            return
+
+        try:
+            # Load OCR
+            with self._model_import_lock:
+                print("  📦 Loading OCR model...")
+                start = time.perf_counter()
+                import torch
+                import easyocr
+            self.metrics.record('import_ocr', time.perf_counter() - start)
+            self.ocr_reader = easyocr.Reader(['en'], gpu=torch.cuda.is_available())
+            print("  ✅ OCR loaded")
+
+        except Exception as e:
+            print(f"  ⚠️  OCR loading failed: {e}")
+            print("  💡 Install with: pip install easyocr")
+            self.ocr_reader = None
+
+    # Config settings that change what the models return for an image
+    RESULT_CONFIG_KEYS = ['clip_model', 'clip_backend', 'categories', 'min_confidence',
+                          'ocr_enabled', 'ocr_text_gate', 'ocr_text_gate_threshold', 'ocr_max_side',
+                          'ocr_canvas_size', 'ocr_max_regions', 'ocr_max_chars',
+                          'cascade', 'cascade_ocr_min_hits', 'cascade_clip_confidence']
+
+    # Bump when the categorization logic itself changes, to invalidate old cache entries
+    RESULT_VERSION = 2
+
+    def _result_fingerprint(self):
+        """Hash of everything besides the image bytes that influences a result"""
+        settings = {key: self.config.get(key) for key in self.RESULT_CONFIG_KEYS}
+        settings['prompts'] = self.category_prompts()
+        settings['version'] = self.RESULT_VERSION
+        encoded = json.dumps(settings, sort_keys=True).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()[:16]
+
+    def open_caches(self):
+        """Open the result cache, near-duplicate index and embedding index (each if enabled)"""
+        self.open_result_cache()
+        self.open_near_duplicate_index()
+        self.open_embedding_index()
+
+    def open_result_cache(self):
+        """
+        Open the on-disk result cache (see ResultCache)
+
+        Enabled with result_cache in config. If the cache can't be opened the
+        organizer simply runs without it.
+        """
+        if self.result_cache or not self.config.get('result_cache') or not self.config.get('cache_folder'):
+            return
+
+        try:
+            db_path = Path(self.config['cache_folder']) / 'results.sqlite3'
+            self.result_cache = ResultCache(
+                db_path,
+                self._result_fingerprint(),
+                max_entries=self.config['result_cache_max_entries']
+            )
+            print(f"  ♻️  Result cache: {db_path}")
+        except Exception as e:
+            print(f"  ⚠️  Result cache disabled: {e}")
+            self.result_cache = None
+
+    def open_near_duplicate_index(self):
+        """
+        Open the persistent near-duplicate index (see NearDuplicateIndex)
+
+        Enabled with near_duplicates in config; runs without it if the
+        index can't be opened.
+        """
+        if self.near_duplicates or not self.config.get('near_duplicates') or not self.config.get('cache_folder'):
+            return
+
+        try:
+            db_path = Path(self.config['cache_folder']) / 'near_duplicates.sqlite3'
+            self.near_duplicates = NearDuplicateIndex(db_path, self._result_fingerprint())
+            print(f"  🔁 Near-duplicate index: {self.near_duplicates.tree.size} images")
+        except Exception as e:
+            print(f"  ⚠️  Near-duplicate detection disabled: {e}")
+            self.near_duplicates = None
+
+    def _embedding_index_path(self):
+        """
+        Base path of the embedding index files; one index per CLIP model
+
+        A shard run keeps its own index in the shard folder, which
+        --merge-shards adds to the main one.
+        """
+        digest = hashlib.sha1(self.config['clip_model'].encode('utf-8')).hexdigest()[:12]
+        if self.leases:
+            return self.leases.folder / f"embeddings_{digest}.{self.leases.run_id}"
+        return Path(self.config['cache_folder']) / f"embeddings_{digest}"
+
+    def open_embedding_index(self):
+        """
+        Open the embedding index used by --search/--similar (see EmbeddingIndex)
+
+        Enabled with embedding_index in config; runs without it if the index
+        can't be opened.
+        """
+        if self.embedding_index or not self.config.get('embedding_index') or not self.config.get('cache_folder'):
+            return
+
+        try:
+            self.embedding_index = EmbeddingIndex(self._embedding_index_path())
+            print(f"  🧭 Embedding index: {self.embedding_index.count} images")
+        except Exception as e:
+            print(f"  ⚠️  Embedding index disabled: {e}")
+            self.embedding_index = None
+
+    def remember_embedding(self, image, category, ocr_text, dest_path):
+        """
+        Index a placed image's CLIP embedding, or note the new location of an indexed one
+
+        An image CLIP didn't look at (cache hit, near-duplicate, OCR-only
+        cascade) that isn't indexed yet is kept as pending, so --reclassify
+        can compute its embedding instead of leaving it behind.
+        """
+        if not self.embedding_index or not isinstance(image, ImageRecord):
+            return
+        try:
+            if image.embedding is not None:
+                self.embedding_index.add(image.embedding, image.content_hash,
+                                         os.path.abspath(dest_path), category, ocr_text)
+            elif image.content_hash is not None:
+                if not self.embedding_index.update(image.content_hash, os.path.abspath(dest_path), category):
+                    self.embedding_index.add_pending(image.content_hash, os.path.abspath(dest_path),
+                                                     category, ocr_text)
+        except Exception as e:
+            print(f"    ⚠️  Could not add {image.name} to the embedding index: {e}")
+
+    def find_near_duplicate(self, record):
+        """
+        Look up an already analyzed image that looks (almost) the same
+
+        Returns the match (category, ocr_text, source, distance) or None.
+        With near_duplicate_folder set, a true near-duplicate is routed to
+        that folder instead of its category; the byte-identical image itself
+        (e.g. a copy-mode re-run) keeps its category.
+        """
+        if not self.near_duplicates:
+            return None
+
+        try:
+            start = time.perf_counter()
+            match = self.near_duplicates.find(record.dhash, self.config['near_duplicate_distance'])
+            self.metrics.record('near_duplicate_lookup', time.perf_counter() - start)
+        except Exception as e:
+            print(f"    ⚠️  Near-duplicate lookup failed: {e}")
+            return None
+
+        if match and self.config['near_duplicate_folder']:
+            if record.content_hash is None:
+                record.content_hash = ResultCache.content_hash(record.path)
+            if record.content_hash != match['content_hash']:
+                match['category'] = self.config['near_duplicate_folder']
+        return match
+
+    def remember_near_duplicate(self, record, category, ocr_text):
+        """Add a freshly analyzed image to the near-duplicate index"""
+        if not self.near_duplicates:
+            return
+        try:
+            if record.content_hash is None and self.config['near_duplicate_folder']:
+                # Needed to tell the image itself apart from its near-duplicates later
+                record.content_hash = ResultCache.content_hash(record.path)
+            self.near_duplicates.add(record.dhash, record.content_hash, category, ocr_text, record.name)
+        except Exception as e:
+            print(f"    ⚠️  Could not index {record.name} for near-duplicates: {e}")
+
+    def category_prompts(self):
+        """Text prompts CLIP compares each screenshot against, one per category"""
+        return [f"a screenshot of {cat.lower()}" for cat in self.config['categories']]
+
+    def _text_embedding_cache_path(self, prompts):
+        """Cache file for category embeddings, keyed by model name and prompts"""
+        if not self.config.get('cache_text_embeddings') or not self.config.get('cache_folder'):
+            return None
+
+        key = json.dumps({'model': self.config['clip_model'], 'prompts': prompts, 'format': 2})
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return Path(self.config['cache_folder']) / f"text_embeddings_{digest}.pt"
+
+    def load_cached_category_embeddings(self):
+        """
+        Load the category embeddings saved by build_category_embeddings()
+
+        Returns True if they were found for this model and these categories.
+        The cache also holds CLIP's logit scale, so classifying needs nothing
+        from the text half of the model.
+        """
+        import torch
+
+        self.category_names = list(self.config['categories'].keys())
+        cache_path = self._text_embedding_cache_path(self.category_prompts())
+        if not cache_path or not cache_path.exists():
+            return False
+
+        try:
+            cached = torch.load(cache_path, map_location=self.device)
+            self.category_embeddings = cached['embeddings']
+            self.clip_logit_scale = float(cached['logit_scale'])
+        except Exception as e:
+            print(f"  ⚠️  Could not read embedding cache, re-encoding: {e}")
+            self.category_embeddings = None
+            return False
+
+        print(f"  ✅ Category embeddings loaded from cache ({len(self.category_names)} categories)")
+        return True
+
+    def build_category_embeddings(self):
+        """
+        Precompute CLIP text embeddings for every category prompt
+
+        The categories don't change during a run, so the text tower only needs
+        to run once instead of once per image. Embeddings are L2-normalized,
+        which turns classification into a single matrix product with the
+        image features. When cache_text_embeddings is enabled the result is
+        saved to cache_folder, and later runs with the same model and
+        categories skip the text tower entirely (see load_clip_model).
+        """
+        import torch
+
+        self.category_names = list(self.config['categories'].keys())
+        prompts = self.category_prompts()
+        self.clip_logit_scale = self.clip_model.logit_scale.exp().item()
+
+        inputs = self.clip_processor(text=prompts, return_tensors="pt", padding=True)
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+
+        with torch.no_grad():
+            text_features = _feature_tensor(self.clip_model.get_text_features(**inputs))
+            text_features = text_features / text_features.norm(dim=-1, keepdim=True)
+
+        self.category_embeddings = text_features
+        print(f"  ✅ Encoded {len(prompts)} category prompts")
+
+        cache_path = self._text_embedding_cache_path(prompts)
+        if cache_path:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                torch.save({'embeddings': text_features.cpu(), 'logit_scale': self.clip_logit_scale}, cache_path)
+            except Exception as e:
+                print(f"  ⚠️  Could not save embedding cache: {e}")
+
+    def load_record(self, image):
+        """Return image as an ImageRecord, reading it from disk if a path was given"""
+        if isinstance(image, ImageRecord):
+            return image
+        start = time.perf_counter()
+        record = ImageRecord.load(image, compute_hash=bool(self.result_cache or self.embedding_index))
+        self.metrics.record('read', time.perf_counter() - start)
+        self.metrics.add_bytes(record.stat.st_size)
+        return record
+
+    def extract_text_ocr(self, image):
+        """
+        Extract text from image using OCR (Optical Character Recognition)
+
+        This helps identify screenshots with text content like:
+        - Code snippets
+        - Error messages
+        - Chat conversations
+        - Documents
+
+        image is an ImageRecord (or a path). See run_ocr for how the work is
+        split and skipped when there's no text.
+        """
+        if not self.ocr_reader:
+            return ""
+
+        text, outcome = self.run_ocr(image)
+        self._count_ocr_outcome(outcome)
+        return text
+
+    def run_ocr(self, image):
+        """
+        OCR one image and report how far it got
+
+        Returns (text, outcome) where outcome is:
+        - 'text'       - detection and recognition ran
+        - 'gated'      - the cheap text check (looks_like_text) found no text,
+                         so EasyOCR didn't run at all
+        - 'no_regions' - the detector found no text regions, so recognition
+                         was skipped
+        - 'failed'     - OCR raised an error
+
+        EasyOCR gets the already decoded pixels instead of re-reading the
+        file: detection runs on the RGB array and recognition on the
+        grayscale one, the same split readtext() does internally.
+
+        Resolution and work limits (all off by default):
+        - ocr_max_side:    downscale so the long edge is at most this many pixels
+        - ocr_canvas_size: size cap for EasyOCR's text detector (EasyOCR default 2560)
+        - ocr_max_regions: only read the first N text regions, top to bottom
+        - ocr_max_chars:   stop reading once this many characters were found -
+                           keywords and the first five filename words are
+                           usually near the top
+        """
+        try:
+            record = self.load_record(image)
+
+            if self.config['ocr_text_gate'] == 'edges' and not self.looks_like_text(record):
+                return "", 'gated'
+
+            rgb, grey = self._ocr_input(record)
+            horizontal_list, free_list = self.ocr_reader.detect(
+                rgb, canvas_size=self.config['ocr_canvas_size'], reformat=False
+            )
+            horizontal_list, free_list = horizontal_list[0], free_list[0]
+            if not horizontal_list and not free_list:
+                return "", 'no_regions'
+
+            if self.config['ocr_max_regions'] or self.config['ocr_max_chars']:
+                result = self._recognize_limited(grey, horizontal_list, free_list)
+            else:
+                result = self.ocr_reader.recognize(
+                    grey, horizontal_list, free_list, detail=0, reformat=False
+                )
+            text = ' '.join(result).lower()
+            return text, 'text'
+        except Exception as e:
+            print(f"    ⚠️  OCR failed: {e}")
+            return "", 'failed'
+
+    def _ocr_input(self, record):
+        """RGB and grayscale arrays for OCR, downscaled to ocr_max_side if needed"""
+        max_side = self.config['ocr_max_side']
+        width, height = record.image.size
+        if not max_side or max(width, height) <= max_side:
+            return record.array, record.grey
+
+        import numpy as np
+        from PIL import Image
+
+        scale = max_side / max(width, height)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        small = record.image.resize(size, Image.BILINEAR, reducing_gap=2.0)
+        return np.asarray(small), np.asarray(small.convert('L'))
+
+    # Text regions recognized per step when ocr_max_chars can stop early
+    OCR_REGION_CHUNK = 8
+
+    def _recognize_limited(self, grey, horizontal_list, free_list):
+        """
+        Recognize text regions in reading order, honoring ocr_max_regions/ocr_max_chars
+
+        Regions are sorted top to bottom (then left to right) and recognized
+        in small chunks, so reading can stop as soon as enough text was found.
+        """
+        # horizontal boxes are [x_min, x_max, y_min, y_max]; free boxes are 4 points
+        regions = [((box[2], box[0]), box, None) for box in horizontal_list]
+        regions += [((min(p[1] for p in poly), min(p[0] for p in poly)), None, poly) for poly in free_list]
+        regions.sort(key=lambda region: region[0])
+
+        if self.config['ocr_max_regions']:
+            regions = regions[:self.config['ocr_max_regions']]
+
+        texts = []
+        for start in range(0, len(regions), self.OCR_REGION_CHUNK):
+            chunk = regions[start:start + self.OCR_REGION_CHUNK]
+            texts += self.ocr_reader.recognize(
+                grey,
+                [box for _, box, _ in chunk if box is not None],
+                [poly for _, _, poly in chunk if poly is not None],
+                detail=0, reformat=False
+            )
+            if self.config['ocr_max_chars'] and sum(len(t) + 1 for t in texts) >= self.config['ocr_max_chars']:
+                break
+        return texts
+
+    def _count_ocr_outcome(self, outcome):
+        """Track how often OCR was skipped (see run_ocr)"""
+        if outcome == 'gated':
+            self._count('ocr_skipped')
+        elif outcome == 'no_regions':
+            self._count('ocr_no_regions')
+
+    # Side of the downscaled image and of the tiles used by looks_like_text
+    TEXT_GATE_SIZE = 512
+    TEXT_GATE_TILE = 16
+
+    def looks_like_text(self, record):
+        """
+        Cheap check for whether an image could contain text
+
+        Text is made of thin, high-contrast strokes, so any area with text has
+        many sharp horizontal brightness changes. The grayscale image is
+        subsampled to ~512px, split into 16x16 tiles, and the share of strong
+        edges is measured per tile. If no tile reaches ocr_text_gate_threshold,
+        the image is treated as textless (flat colors, smooth photos) and OCR is
+        skipped. Measuring per tile keeps a single line of small text on a big
+        empty screen from being averaged away. Takes a few milliseconds,
+        against seconds for EasyOCR on CPU.
+        """
+        import numpy as np
+
+        grey = record.grey
+        step = max(1, -(-max(grey.shape) // self.TEXT_GATE_SIZE))
+        small = grey[::step, ::step].astype(np.int16)
+
+        edges = np.abs(np.diff(small, axis=1)) > 40
+        tile = self.TEXT_GATE_TILE
+        rows, cols = edges.shape[0] // tile, edges.shape[1] // tile
+        if rows == 0 or cols == 0:
+            return True  # Too small to judge - let OCR decide
+
+        tiles = edges[:rows * tile, :cols * tile].reshape(rows, tile, cols, tile)
+        densest = tiles.mean(axis=(1, 3)).max()
+        return densest >= self.config['ocr_text_gate_threshold']
+
+    def _clip_image_features(self, images):
+        """Normalized CLIP image embeddings for a list of PIL images, in one forward pass"""
+        inputs = self.clip_processor(images=images, return_tensors="pt")
+        pixel_values = inputs['pixel_values'].to(self.device)
+
+        # Normalized image features from the configured backend (see load_clip_backend)
+        return self.image_encoder(pixel_values)
+
+    def _clip_probabilities(self, images, records=None):
+        """
+        Run the CLIP image tower on a list of PIL images in one forward pass
+
+        Returns a (num_images, num_categories) tensor of softmax probabilities
+        against the precomputed category embeddings. If the ImageRecords the
+        images came from are given, each keeps its embedding for the
+        embedding index.
+        """
+        import torch
+
+        image_features = self._clip_image_features(images).to(self.category_embeddings.device)
+        if records is not None and self.embedding_index:
+            for record, features in zip(records, image_features.float().cpu().numpy()):
+                record.embedding = features
+
+        with torch.no_grad():
+            # Same logits CLIPModel.forward would produce, without the text tower
+            logits_per_image = self.clip_logit_scale * image_features @ self.category_embeddings.T
+            return logits_per_image.softmax(dim=1)
+
+    def classify_with_clip(self, image):
+        """
+        Classify image using CLIP (Contrastive Language-Image Pre-training)
+
+        CLIP understands visual content and matches it with text descriptions
+        Returns the best matching category and confidence score (0.0 to 1.0)
+
+        Only the image tower runs here - the category prompts were encoded
+        once by build_category_embeddings(). image is an ImageRecord (or a path).
+        """
+        if not self.clip_model or self.category_embeddings is None:
+            return None, 0.0
+
+        try:
+            record = self.load_record(image)
+            probs = self._clip_probabilities([record.image], [record])
+
+            # Get best match
+            confidence, idx = probs[0].max(0)
+            category = self.category_names[idx.item()]
+
+            return category, confidence.item()
+
+        except Exception as e:
+            print(f"    ⚠️  CLIP failed: {e}")
+            return None, 0.0
+
+    def classify_batch_with_clip(self, images):
+        """
+        Classify several images with a single CLIP forward pass
+
+        Batching keeps the CPU/GPU busy with one large matrix multiply instead
+        of many tiny ones. Takes ImageRecords (or paths) and returns one
+        (category, confidence) tuple per image, in the same order, matching
+        what classify_with_clip would return. Images that can't be decoded
+        get (None, 0.0) without failing the batch.
+        """
+        results = [(None, 0.0)] * len(images)
+        if not self.clip_model or self.category_embeddings is None:
+            return results
+
+        decoded = []
+        records = []
+        positions = []
+        for position, image in enumerate(images):
+            try:
+                record = self.load_record(image)
+                decoded.append(record.image)
+                records.append(record)
+                positions.append(position)
+            except Exception as e:
+                name = image.name if isinstance(image, ImageRecord) else os.path.basename(str(image))
+                print(f"    ⚠️  CLIP failed for {name}: {e}")
+
+        if not decoded:
+            return results
+
+        try:
+            probs = self._clip_probabilities(decoded, records)
+            confidences, indices = probs.max(dim=1)
+
+            for position, confidence, idx in zip(positions, confidences.tolist(), indices.tolist()):
+                results[position] = (self.category_names[idx], confidence)
+
+        except Exception as e:
+            print(f"    ⚠️  CLIP batch failed: {e}")
+
+        return results
+
+    def determine_category(self, image, clip_result=None, near_duplicate=NOT_LOOKED_UP):
+        """
+        Determine category using OCR + CLIP (hybrid approach)
+
+        Strategy:
+        1. OCR extracts text and counts keyword hits per category from config.json
+        2. CLIP analyzes visual content
+        3. Combine both results for best accuracy:
+           - If both agree → use that category
+           - If OCR finds specific keywords → trust OCR (more precise)
+           - If CLIP has high confidence → trust CLIP
+           - Otherwise → mark as Uncategorized
+
+        clip_result can carry a (category, confidence) tuple that was already
+        computed by classify_batch_with_clip, so CLIP isn't run twice;
+        near_duplicate likewise the find_near_duplicate() result if the
+        caller already looked it up
+
+        When the result cache is enabled, an image whose content was analyzed
+        before is answered from the cache and neither model runs.
+
+        image is an ImageRecord (or a path), shared by both models so the
+        file is decoded only once.
+        """
+        record = self.load_record(image)
+        print(f"  🔍 Analyzing: {record.name}")
+
+        known = self.known_result(record, near_duplicate)
+        if known:
+            category, ocr_text, near = known
+            if near:
+                print(f"    🔁 Near-duplicate of {near['source']} (distance {near['distance']}): {category}")
+            else:
+                print(f"    ♻️  Cached result: {category}")
+            return category, ocr_text
+
+        # Models may still be loading in the background (see start_model_loading)
+        self.wait_for_models()
+
+        if self.cascade_first():
+            # Cascade mode: the second model only runs if the first isn't decisive
+            ocr_text, clip_result = self._run_cascade(record, clip_result)
+        else:
+            if self.config['cascade'] == 'auto' and self.ocr_reader and self.clip_model:
+                # Still timing both models before 'auto' can choose
+                self._count('cascade_both')
+
+            # Step 1: Extract text with OCR
+            ocr_text = self._timed('ocr', self.extract_text_ocr, record) if self.ocr_reader else ""
+
+            # Step 2: Classify with CLIP (visual analysis)
+            if clip_result is None:
+                clip_result = self._timed('clip', self.classify_with_clip, record)
+
+        if ocr_text:
+            print(f"    📝 OCR text: {ocr_text[:100]}...")
+        clip_category, confidence = clip_result
+
+        # Step 3: Combine results intelligently
+        final_category, ocr_category = self.remember_result(record, ocr_text, clip_result)
+
+        if ocr_category:
+            print(f"    🎯 OCR suggests: {ocr_category}")
+        if clip_category:
+            print(f"    🤖 CLIP suggests: {clip_category} (confidence: {confidence:.2f})")
+
+        print(f"    ✅ Final category: {final_category}")
+        return final_category, ocr_text
+
+    def known_result(self, record, near_duplicate=NOT_LOOKED_UP):
+        """
+        Answer an image from the result cache or the near-duplicate index, before any model runs
+
+        Returns (category, ocr_text, near) - near is the find_near_duplicate()
+        match, or None for a result cache hit - or None if the models have
+        to look at the image. near_duplicate is the match if the caller
+        already looked it up. Shared by every path that organizes a file
+        (determine_category, organize_pipeline, AsyncOrganizer).
+        """
+        if self.result_cache:
+            start = time.perf_counter()
+            if record.content_hash is None:
+                record.content_hash = self.result_cache.content_hash(record.path)
+            cached = self.result_cache.get(record.content_hash)
+            self.metrics.record('cache_lookup', time.perf_counter() - start)
+            if cached:
+                return cached['category'], cached['ocr_text'], None
+
+        near = self.find_near_duplicate(record) if near_duplicate is NOT_LOOKED_UP else near_duplicate
+        if near:
+            self._count('near_duplicates')
+            return near['category'], near['ocr_text'], near
+        return None
+
+    def remember_result(self, record, ocr_text, clip_result):
+        """
+        Fuse fresh OCR and CLIP results and remember them for known_result()
+
+        Stores the outcome in the result cache and the near-duplicate index.
+        Returns (final_category, ocr_category) like combine_results.
+        """
+        start = time.perf_counter()
+        final_category, ocr_category = self.combine_results(ocr_text, clip_result)
+        self.metrics.record('keywords', time.perf_counter() - start)
+
+        if self.result_cache:
+            if record.content_hash is None:
+                record.content_hash = self.result_cache.content_hash(record.path)
+            self.result_cache.put(record.content_hash, ocr_text, clip_result[0], clip_result[1], final_category)
+        self.remember_near_duplicate(record, final_category, ocr_text)
+        return final_category, ocr_category
+
+    def _timed(self, model, func, *args):
+        """Call func and fold its duration into the running latency average for model"""
+        start = time.perf_counter()
+        result = func(*args)
+        self._record_latency(model, time.perf_counter() - start)
+        return result
+
+    def _record_latency(self, model, seconds, count=1):
+        """
+        Exponential moving average of per-image latency, used by cascade 'auto'
+
+        Also feeds the per-stage metrics; count > 1 records a batch whose
+        per-image share was seconds.
+        """
+        self.metrics.record(model, seconds, count)
+        previous = self.model_latency.get(model)
+        self.model_latency[model] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    def cascade_first(self):
+        """
+        Which model the cascade runs first: 'ocr', 'clip', or None to run both
+
+        'auto' picks whichever model has been cheaper per image so far and runs
+        both until each has been timed at least once. The cascade only makes
+        sense when both models are loaded.
+        """
+        mode = self.config['cascade']
+        if mode == 'off' or not (self.ocr_reader and self.clip_model):
+            return None
+        if mode == 'ocr_first':
+            return 'ocr'
+        if mode == 'clip_first':
+            return 'clip'
+
+        ocr_latency = self.model_latency.get('ocr')
+        clip_latency = self.model_latency.get('clip')
+        if ocr_latency is None or clip_latency is None:
+            return None
+        return 'ocr' if ocr_latency <= clip_latency else 'clip'
+
+    def _run_cascade(self, record, clip_result=None):
+        """
+        Run the cheaper model first and the other one only when needed
+
+        - OCR is decisive when its best category has at least
+          cascade_ocr_min_hits keyword hits - CLIP is skipped.
+        - CLIP is decisive when its confidence is at least
+          cascade_clip_confidence - OCR is skipped. At 0.5 or above CLIP
+          already wins every disagreement in combine_results, so the category
+          is the same as running both; only the OCR words for the filename
+          are lost.
+
+        Returns (ocr_text, clip_result) with "" / (None, 0.0) for a skipped
+        model. A cascade_audit_rate share of images also runs the skipped
+        model, to count how often the cascade changes the final category.
+        """
+        first = self.cascade_first()
+        ocr_text, ocr_done = "", False
+        clip_done = clip_result is not None
+
+        if first == 'ocr':
+            ocr_text = self._timed('ocr', self.extract_text_ocr, record)
+            ocr_done = True
+            _, hits = self.keyword_matcher.best(ocr_text)
+            decisive = hits >= self.config['cascade_ocr_min_hits']
+        else:
+            if not clip_done:
+                clip_result = self._timed('clip', self.classify_with_clip, record)
+                clip_done = True
+            decisive = clip_result[0] is not None and clip_result[1] >= self.config['cascade_clip_confidence']
+
+        if not decisive:
+            self._count('cascade_both')
+            if not ocr_done:
+                ocr_text = self._timed('ocr', self.extract_text_ocr, record)
+            if not clip_done:
+                clip_result = self._timed('clip', self.classify_with_clip, record)
+            return ocr_text, clip_result
+
+        self._count('cascade_ocr_only' if first == 'ocr' else 'cascade_clip_only')
+        if clip_result is None:
+            clip_result = (None, 0.0)
+
+        if self._should_audit():
+            # Compare against what running both models would have decided
+            full_text = ocr_text if ocr_done else self.extract_text_ocr(record)
+            full_clip = clip_result if clip_done else self.classify_with_clip(record)
+            cascade_category, _ = self.combine_results(ocr_text, clip_result)
+            full_category, _ = self.combine_results(full_text, full_clip)
+            self._count('cascade_audited')
+            if cascade_category != full_category:
+                self._count('cascade_audit_changed')
+
+        print(f"    ⏩ Cascade: {first.upper()} was decisive, skipped {'CLIP' if first == 'ocr' else 'OCR'}")
+        return ocr_text, clip_result
+
+    def _should_audit(self):
+        """Deterministically pick every 1/cascade_audit_rate-th decisive image for auditing"""
+        rate = self.config['cascade_audit_rate']
+        if rate <= 0:
+            return False
+        self._audit_counter += 1
+        return int(self._audit_counter * rate) > int((self._audit_counter - 1) * rate)
+
+    @property
+    def keyword_matcher(self):
+        """KeywordMatcher for config['categories'], compiled on first use"""
+        if self._keyword_matcher is None:
+            self._keyword_matcher = KeywordMatcher(self.config['categories'])
+        return self._keyword_matcher
+
+    def combine_results(self, ocr_text, clip_result):
+        """
+        Fuse the OCR text and CLIP prediction into a final category
+
+        Returns (final_category, ocr_category) - see determine_category for
+        the rules. The OCR suggestion is the category with the most keyword
+        hits (ties go to the category listed first in config). Doesn't print
+        anything, so it's safe to call from the parallel pipeline's worker
+        threads.
+        """
+        clip_category, confidence = clip_result
+
+        # Match keywords from config.json categories
+        ocr_category, _ = self.keyword_matcher.best(ocr_text)
+
+        if ocr_category and clip_category:
+            # Both models have opinions
+            if ocr_category == clip_category:
+                # Both agree - high confidence!
+                final_category = ocr_category
+            elif confidence < 0.5:
+                # CLIP not confident, trust OCR keywords
+                final_category = ocr_category
+            else:
+                # CLIP is confident, trust it
+                final_category = clip_category
+        elif ocr_category:
+            # Only OCR found something
+            final_category = ocr_category
+        elif clip_category and confidence > self.config['min_confidence']:
+            # Only CLIP found something with good confidence
+            final_category = clip_category
+        else:
+            # Neither model is confident
+            final_category = 'Uncategorized'
+
+        return final_category, ocr_category
+
+    def combine_many(self, ocr_texts, probabilities):
+        """
+        combine_results for many images at once
+
+        ocr_texts is a list of OCR texts and probabilities the matching
+        (images, categories) CLIP softmax. Keyword hits are counted into one
+        (images, categories) array (each distinct text scanned once), then
+        the fusion rules of combine_results run as array operations.
+        Returns the final category of every image.
+        """
+        import numpy as np
+
+        matcher = self.keyword_matcher
+        hits = np.zeros(probabilities.shape, dtype=np.int32)
+        scanned = {}
+        for i, text in enumerate(ocr_texts):
+            if text not in scanned:
+                scanned[text] = matcher.scores(text)
+            hits[i] = scanned[text]
+
+        # argmax picks the first maximum, so ties go to the category listed first
+        ocr_best = hits.argmax(axis=1)
+        has_ocr = hits.max(axis=1) > 0
+        clip_best = probabilities.argmax(axis=1)
+        confidence = probabilities.max(axis=1)
+
+        trust_ocr = has_ocr & ((ocr_best == clip_best) | (confidence < 0.5))
+        clip_confident = ~has_ocr & (confidence > self.config['min_confidence'])
+        final = np.where(trust_ocr, ocr_best, np.where(has_ocr | clip_confident, clip_best, -1))
+
+        names = list(self.config['categories'])
+        return [names[i] if i >= 0 else 'Uncategorized' for i in final.tolist()]
+
+    def generate_filename(self, image, category, ocr_text):
+        """
+        Generate descriptive filename based on content
+
+        If rename_files is enabled in config:
+        - Extracts meaningful words from OCR text
+        - Adds date from file metadata
+        - Creates readable filename like: python_error_traceback_2025-12-05.png
+
+        Otherwise keeps original filename. image is an ImageRecord (its stat
+        result is reused) or a path.
+        """
+        original_path = image.path if isinstance(image, ImageRecord) else image
+        if not self.config['rename_files']:
+            return os.path.basename(original_path)
+
+        # Extract date from original filename or use file modification time
+        original_name = os.path.basename(original_path)
+        file_ext = os.path.splitext(original_name)[1]
+
+        # Get file date
+        mod_time = self._file_mtime(image)
+        date_str = datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d')
+
+        # Generate descriptive part from OCR text
+        if ocr_text:
+            # Extract meaningful words (simple approach)
+            words = ocr_text.split()[:5]  # First 5 words
+            desc = '_'.join(w for w in words if len(w) > 3)[:30]  # Max 30 chars
+            desc = ''.join(c if c.isalnum() or c == '_' else '_' for c in desc)
+        else:
+            desc = category.lower()
+
+        new_name = f"{desc}_{date_str}{file_ext}"
+
+        # Ensure unique filename
+        return new_name
+
+    def _file_mtime(self, image):
+        """Modification time from an ImageRecord's stat result, or from disk for a path"""
+        if isinstance(image, ImageRecord):
+            return image.stat.st_mtime
+        return os.path.getmtime(image)
+
+    def organize_file(self, image, clip_result=None, near_duplicate=NOT_LOOKED_UP):
+        """
+        Organize a single file through the complete pipeline:
+        1. Analyze and categorize
+        2. Create destination folder structure
+        3. Generate new filename (if enabled)
+        4. Move or copy file
+        5. Update statistics
+
+        image is a path or an ImageRecord. The file is read, stat'ed and
+        decoded once and the record is shared by every step. clip_result and
+        near_duplicate are passed through to determine_category (see
+        organize_batch).
+
+        Returns a result dict (source, status, category, destination or
+        error) that callers like the --serve daemon can report back.
+        """
+        image_path = image.path if isinstance(image, ImageRecord) else str(image)
+        start = time.perf_counter()
+        try:
+            self._count('total')
+            record = self.load_record(image)
+
+            # Determine category
+            category, ocr_text = self.determine_category(record, clip_result, near_duplicate)
+
+            dest_path = self.place_file(record, category, ocr_text)
+            if record.decode_seconds is not None:
+                self.metrics.record('decode', record.decode_seconds)
+            self.metrics.record('total', time.perf_counter() - start)
+
+            if self.config['move_or_copy'] == 'move':
+                print(f"    📦 Moved to: {dest_path}")
+            else:
+                print(f"    📦 Copied to: {dest_path}")
+
+            return self._file_result(image_path, category=category, destination=dest_path)
+
+        except Exception as e:
+            print(f"    ❌ Error: {e}")
+            self._count('failed')
+            return self._file_result(image_path, error=e)
+
+    @staticmethod
+    def _file_result(image_path, category=None, destination=None, error=None):
+        """Per-file outcome as a JSON-friendly dict"""
+        if error is not None:
+            return {'source': str(image_path), 'status': 'error', 'error': str(error)}
+        return {'source': str(image_path), 'status': 'ok',
+                'category': category, 'destination': str(destination)}
 
-        # Initialize models (lazy loading)
+    def _count(self, key, category=None):
+        """Increment a stats counter (thread-safe, used by the parallel pipeline too)"""
+        with self._stats_lock:
+            if category is not None:
+                self.stats['categories'][category] = self.stats['categories'].get(category, 0) + 1
+            else:
+                self.stats[key] += 1
+
+    def _destination_folder(self, image, category):
+        """Folder an image of this category goes to: the category folder, plus year-month with organize_by_date"""
+        dest_base = Path(self.config['destination_folder']) / category
+
+        if self.config['organize_by_date']:
+            mod_time = self._file_mtime(image)
+            date_folder = datetime.fromtimestamp(mod_time).strftime('%Y-%m')
+            dest_base = dest_base / date_folder
+        return dest_base
+
+    def place_file(self, image, category, ocr_text):
+        """
+        Move or copy an already categorized image into the destination tree
+
+        Creates the category (and date) folder, picks a unique filename and
+        updates the statistics. Returns the destination path. Safe to call
+        from several threads at once - PlacementPlanner reserves filenames
+        so two workers never pick the same destination.
+        """
+        image_path = image.path if isinstance(image, ImageRecord) else image
+        start = time.perf_counter()
+
+        # Update stats
+        self._count('categories', category)
+
+        # Create destination path
+        dest_base = self._destination_folder(image, category)
+
+        # Generate filename; duplicates get _1, _2, ... (see PlacementPlanner)
+        new_filename = self.generate_filename(image, category, ocr_text)
+        dest_path = self.placement.reserve(dest_base, new_filename)
+
+        if self.config['move_or_copy'] == 'move':
+            method = 'move'
+        else:
+            method = self.config['copy_method']
+            if method not in PlacementPlanner.COPY_METHODS:
+                method = 'copy'
+
+        created = False
+        journal_entry = None
+        try:
+            stat = image.stat if isinstance(image, ImageRecord) else os.stat(image_path)
+            if self.journal:
+                journal_entry = self.journal.intent(image_path, dest_path, category, stat)
+
+            # Move or copy file
+            while True:
+                try:
+                    self.placement.transfer(str(image_path), dest_path, method, stat)
+                except FileNotFoundError:
+                    if not os.path.exists(image_path):
+                        raise
+                    # The destination folder was deleted since it was listed
+                    self.placement.forget(dest_base)
+                    dest_base.mkdir(parents=True, exist_ok=True)
+                    self.placement.transfer(str(image_path), dest_path, method, stat)
+                except FileExistsError:
+                    # Another process took the name meanwhile (exclusive placement, --shard)
+                    if journal_entry:
+                        self.journal.abort(journal_entry)
+                    dest_path = self.placement.reserve(dest_base, new_filename)
+                    if self.journal:
+                        journal_entry = self.journal.intent(image_path, dest_path, category, stat)
+                    continue
+                break
+            created = True
+        finally:
+            if not created:
+                # Close the intent before the name can go to the next image,
+                # or --resume would roll back that image's file
+                if journal_entry:
+                    self.journal.abort(journal_entry)
+                self.placement.release(dest_path)
+
+        if journal_entry:
+            self.journal.complete(journal_entry)
+        self.remember_embedding(image, category, ocr_text, dest_path)
+        self._count('processed')
+        self.metrics.record('place', time.perf_counter() - start)
+        self.metrics.mark_result()
+        return Path(dest_path)
+
+    def find_images(self, folder):
+        """Find all image files in folder (see iter_images)"""
+        return list(self.iter_images(folder))
+
+    def iter_images(self, folder, recursive=None):
+        """
+        Yield image paths in folder as they are found
+
+        Each directory is listed once with os.scandir and extensions are
+        matched case-insensitively against a set, so every file is seen
+        exactly once - also on case-insensitive filesystems. With recursive
+        (defaults to the 'recursive' config setting) subfolders are scanned
+        too, except the destination and cache folders; symlinked folders are
+        not followed. Because paths are yielded lazily, organizing can start
+        before a huge folder has been fully listed.
+        """
+        if recursive is None:
+            recursive = self.config.get('recursive', False)
+        extensions = {ext.lower() for ext in self.config['image_extensions']}
+        excluded = self._excluded_folders()
+        pending = [os.fspath(folder)]
+
+        while pending:
+            directory = pending.pop()
+            subfolders = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                if os.path.splitext(entry.name)[1].lower() in extensions:
+                                    yield entry.path
+                            elif (recursive and entry.is_dir(follow_symlinks=False)
+                                  and os.path.realpath(entry.path) not in excluded):
+                                subfolders.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError as e:
+                print(f"  ⚠️  Could not scan {directory}: {e}")
+
+            # Depth-first, subfolders in name order
+            pending.extend(sorted(subfolders, reverse=True))
+
+    def _excluded_folders(self):
+        """Resolved folders a recursive scan must skip (our own output and caches)"""
+        folders = [self.config['destination_folder'], self.config.get('cache_folder')]
+        return {os.path.realpath(os.path.expanduser(folder)) for folder in folders if folder}
+
+    def organize_batch(self, image_paths, start_index=None, total=None, on_result=None):
+        """
+        Organize a group of images, running CLIP once for the whole group
+
+        Images are split into chunks of clip_batch_size. Each chunk goes
+        through classify_batch_with_clip in one forward pass, then every image
+        continues through the usual organize_file pipeline (OCR, category
+        fusion, move/copy) with its precomputed CLIP result. Images already in
+        the result cache are left out of the CLIP batch entirely.
+
+        image_paths may be any iterable, e.g. the iter_images generator;
+        batches are taken from it as they fill up.
+        start_index/total are only used for the [i/N] progress lines
+        (just [i] when total is None).
+        on_result, if given, is called with each file's result dict.
+        """
+        image_paths = iter(image_paths)
+        batch_size = max(1, int(self.config.get('clip_batch_size', 1)))
+        batch_start = 0
+
+        while True:
+            batch = [str(p) for p in itertools.islice(image_paths, batch_size)]
+            if not batch:
+                break
+
+            # Read (and hash) every file once; unreadable ones stay paths so
+            # organize_file reports the error
+            records = [self._try_load_record(p) for p in batch]
+            clip_results = [None] * len(batch)
+            nears = [NOT_LOOKED_UP] * len(batch)
+
+            # Only images the caches can't answer need CLIP. The near-duplicate
+            # lookup is handed on, so determine_category doesn't repeat it
+            uncached = []
+            for i, record in enumerate(records):
+                if not isinstance(record, ImageRecord):
+                    continue
+                if self.result_cache and self.result_cache.contains(record.content_hash):
+                    continue
+                nears[i] = self.find_near_duplicate(record)
+                if not nears[i]:
+                    uncached.append(i)
+
+            if uncached:
+                self.wait_for_models()
+
+            # With an OCR-first cascade CLIP may not be needed at all, so don't batch it
+            if self.clip_model and len(uncached) > 1 and self.cascade_first() != 'ocr':
+                print(f"\n🤖 Running CLIP on a batch of {len(uncached)} images...")
+                start = time.perf_counter()
+                batch_results = self.classify_batch_with_clip([records[i] for i in uncached])
+                self._record_latency('clip', (time.perf_counter() - start) / len(uncached), len(uncached))
+                for i, clip_result in zip(uncached, batch_results):
+                    clip_results[i] = clip_result
+
+            for offset, record in enumerate(records):
+                if start_index is not None:
+                    position = start_index + batch_start + offset
+                    print(f"\n[{position}/{total}]" if total else f"\n[{position}]")
+                result = self.organize_file(record, clip_results[offset], nears[offset])
+                if on_result:
+                    on_result(result)
+                if isinstance(record, ImageRecord):
+                    record.release()
+
+            batch_start += len(batch)
+
+    def _try_load_record(self, image_path):
+        """ImageRecord for image_path, or the path itself if the file can't be read"""
+        try:
+            return self.load_record(image_path)
+        except OSError:
+            return image_path
+
+    def organize_pipeline(self, image_paths, workers, on_result=None):
+        """
+        Organize images with a staged, parallel pipeline
+
+        The serial path (organize_batch) leaves the CPU idle during disk I/O
+        and the disk idle during inference. Here the stages overlap:
+
+        1. Load   - thread pool reads, hashes and decodes each image once
+        2. OCR    - process pool (EasyOCR holds the GIL), one reader per process,
+                    fed the already decoded pixels
+        3. CLIP   - a single consumer thread classifies images in batches
+        4. Place  - thread pool waits for OCR, fuses results, moves/copies files
+
+        Stages are connected by bounded queues, so a slow stage applies
+        backpressure instead of piling decoded images up in memory.
+        Statistics are updated under a lock and stay exact. on_result is
+        called with each file's result dict (from worker threads).
+        image_paths may be a generator (see iter_images); it is consumed as
+        the pipeline has room, so loading starts with the first file found.
+        """
+        import queue
+        from concurrent.futures import ThreadPoolExecutor
+
+        total = len(image_paths) if hasattr(image_paths, '__len__') else None
+        batch_size = max(1, int(self.config.get('clip_batch_size', 1)))
+        queue_size = max(batch_size * 2, workers * 2)
+
+        print(f"⚙️  Pipeline mode: {workers} workers, CLIP batches of {batch_size}\n")
+        if self.config['cascade'] != 'off':
+            print("  💡 cascade is ignored in pipeline mode - OCR and CLIP already run side by side\n")
+
+        # Bounds the number of images in flight across all stages
+        in_flight = threading.BoundedSemaphore(queue_size)
+        clip_queue = queue.Queue(maxsize=queue_size)
+        done_counter = [0]
+        done_lock = threading.Lock()
+        end_of_input = object()
+        # Set if the models failed to load; remaining images are left alone
+        model_failure = []
+
+        # OCR runs in worker processes with their own reader, kept between
+        # calls (see ocr_worker_pool)
+        ocr_pool = None
+        if self.config['ocr_enabled'] and (self.ocr_reader or self._ocr_in_workers):
+            ocr_pool = self.ocr_worker_pool(workers)
+
+        load_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='load')
+        place_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='place')
+
+        def report(result, cached=False):
+            if result['status'] == 'ok':
+                message = f"{'♻️  ' if cached else ''}→ {result['destination']}"
+            else:
+                message = f"❌ Error: {result['error']}"
+            with done_lock:
+                done_counter[0] += 1
+                position = f"{done_counter[0]}/{total}" if total else f"{done_counter[0]}"
+                print(f"[{position}] {os.path.basename(result['source'])} {message}")
+            if on_result:
+                on_result(result)
+
+        def finish(record, ocr_text, clip_result):
+            # Stage 4: fuse results and place the file
+            try:
+                category, _ = self.remember_result(record, ocr_text, clip_result)
+                if record.decode_seconds is not None:
+                    self.metrics.record('decode', record.decode_seconds)
+                dest_path = self.place_file(record, category, ocr_text)
+                report(self._file_result(record.path, category=category, destination=dest_path))
+            except Exception as e:
+                self._count('failed')
+                report(self._file_result(record.path, error=e))
+            finally:
+                record.release()
+                in_flight.release()
+
+        def finish_after_ocr(record, ocr_future, clip_result):
+            try:
+                ocr_text, outcome, seconds = ocr_future.result() if ocr_future else ("", None, None)
+                self._count_ocr_outcome(outcome)
+                if seconds is not None:
+                    self.metrics.record('ocr', seconds)
+            except Exception as e:
+                print(f"    ⚠️  OCR failed for {record.name}: {e}")
+                ocr_text = ""
+            finish(record, ocr_text, clip_result)
+
+        def load(image_path):
+            # Stage 1: read + hash, answer from cache, or decode and hand off to OCR + CLIP
+            try:
+                record = self.load_record(image_path)
+                known = self.known_result(record)
+                if known:
+                    category, ocr_text, _ = known
+                    dest_path = self.place_file(record, category, ocr_text)
+                    report(self._file_result(image_path, category=category, destination=dest_path),
+                           cached=True)
+                    in_flight.release()
+                    return
+
+                # Decode here, in the I/O pool, so neither model stage waits on it
+                record.array
+                ocr_future = ocr_pool.submit(_ocr_worker_extract, record) if ocr_pool else None
+                clip_queue.put((record, ocr_future))
+
+            except Exception as e:
+                self._count('failed')
+                report(self._file_result(image_path, error=e))
+                in_flight.release()
+
+        def clip_consumer():
+            # Stage 3: collect images into batches and classify them together.
+            # The models finish loading while the first images are read and decoded
+            try:
+                self.wait_for_models()
+            except SystemExit as e:
+                model_failure.append(e)
+
+            finished = False
+            while not finished:
+                batch = [clip_queue.get()]
+                while len(batch) < batch_size:
+                    try:
+                        batch.append(clip_queue.get(timeout=0.05))
+                    except queue.Empty:
+                        break
+
+                if batch[-1] is end_of_input:
+                    batch.pop()
+                    finished = True
+                if not batch:
+                    continue
+                if model_failure:
+                    for record, _ in batch:
+                        record.release()
+                        in_flight.release()
+                    continue
+
+                clip_results = [(None, 0.0)] * len(batch)
+                if self.clip_model:
+                    try:
+                        start = time.perf_counter()
+                        probs = self._clip_probabilities([record.image for record, _ in batch],
+                                                         [record for record, _ in batch])
+                        self.metrics.record('clip', (time.perf_counter() - start) / len(batch), len(batch))
+                        confidences, indices = probs.max(dim=1)
+                        clip_results = [
+                            (self.category_names[idx], confidence)
+                            for confidence, idx in zip(confidences.tolist(), indices.tolist())
+                        ]
+                    except Exception as e:
+                        print(f"    ⚠️  CLIP batch failed: {e}")
+
+                for (record, ocr_future), clip_result in zip(batch, clip_results):
+                    place_pool.submit(finish_after_ocr, record, ocr_future, clip_result)
+
+        consumer = threading.Thread(target=clip_consumer, name='clip', daemon=True)
+        consumer.start()
+
+        try:
+            for image_path in image_paths:
+                in_flight.acquire()
+                if model_failure:
+                    in_flight.release()
+                    break
+                self._count('total')
+                load_pool.submit(load, str(image_path))
+
+            load_pool.shutdown(wait=True)
+            # end_of_input is the last item, so the consumer drains everything before it
+            clip_queue.put(end_of_input)
+            consumer.join()
+            place_pool.shutdown(wait=True)
+            if model_failure:
+                raise model_failure[0]
+        except BaseException:
+            # Interrupted: drop the OCR work still queued for this call
+            self.shutdown_ocr_pool()
+            raise
+        finally:
+            load_pool.shutdown(wait=False, cancel_futures=True)
+            place_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _workers(self):
+        return int(self.config.get('workers', 1))
+
+    def ocr_worker_pool(self, workers):
+        """
+        Process pool running OCR for the parallel pipeline, created once per session
+
+        Spawning the workers re-imports this script and loads EasyOCR in
+        each of them, which takes seconds. watch, --serve and repeated
+        organize_pipeline calls therefore reuse the same pool; a no-op task
+        per worker starts them loading right away instead of with the first
+        image. The pool is replaced if workers changes, stopped with the
+        models by unload_models() and for good by cleanup().
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if self._ocr_pool is not None and self._ocr_pool_workers == workers:
+            return self._ocr_pool
+        self.shutdown_ocr_pool()
+
+        self._ocr_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_ocr_worker_init,
+            initargs=(self.config_path, self.config, self.ocr_reader_factory)
+        )
+        self._ocr_pool_workers = workers
+        for _ in range(workers):
+            self._ocr_pool.submit(_ocr_worker_ready)
+        return self._ocr_pool
+
+    def shutdown_ocr_pool(self):
+        """Stop the OCR worker processes; queued OCR work is dropped"""
+        if self._ocr_pool is not None:
+            self._ocr_pool.shutdown(wait=True, cancel_futures=True)
+            self._ocr_pool = None
+            self._ocr_pool_workers = 0
+
+    def cleanup(self):
+        """Release what outlives a single run: the OCR worker processes"""
+        self.shutdown_ocr_pool()
+
+    def organize_images(self, image_paths, start_index=None, total=None, on_result=None):
+        """Organize images with the parallel pipeline if workers > 1, else serially in batches"""
+        workers = self._workers()
+        if workers > 1:
+            self.organize_pipeline(image_paths, workers, on_result)
+        else:
+            self.organize_batch(image_paths, start_index, total, on_result)
+
+    def organize_once(self, source_folder=None, resume=False):
+        """
+        Organize all images in folder once
+
+        With the journal enabled, every file operation is logged so an
+        interrupted run can continue with resume=True (--resume): finished
+        images are skipped, their statistics restored, and half-done
+        operations completed or rolled back (see Journal).
+        """
+        source = source_folder or self.config['source_folder']
+
+        print(f"\n🚀 Starting one-time organization...")
+        print(f"📂 Source: {source}")
+        print(f"📂 Destination: {self.config['destination_folder']}\n")
+
+        if self.shard:
+            self.leases = ShardLeases(self._shard_folder(source), source, *self.shard,
+                                      self.config['shard_lease_minutes'] * 60)
+            # Other shards place files into the same tree
+            self.placement.exclusive = True
+            print(f"🧩 Shard {self.shard[0]}/{self.shard[1]}, leases in {self.leases.folder}\n")
+
+        # Load the models in the background while scanning and reading the
+        # first images; the pipeline loads OCR in its worker processes
+        self.metrics.restart()
+        self.start_model_loading()
+
+        # Scan and organize at the same time, so the first image doesn't
+        # wait for a huge folder to be fully listed
+        print(f"📸 Scanning for images{' (including subfolders)' if self.config['recursive'] else ''}...\n")
+
+        images = self.iter_images(source)
+        self.open_journal(source, resume)
+        if self.journal and self.journal.done:
+            images = (path for path in images if not self.journal.is_done(path))
+        # Counts restored by --resume were reported by the interrupted run
+        restored = json.loads(json.dumps(self.stats))
+        if self.leases:
+            images = self.leases.claim_all(images)
+
+        finished = False
+        try:
+            # Process images in CLIP-sized batches (or the parallel pipeline)
+            self.organize_images(images, start_index=1, on_result=self.leases.finish if self.leases else None)
+            finished = True
+        finally:
+            if self.journal:
+                # An interrupted run keeps its journal for --resume
+                self.journal.close(remove=finished)
+                self.journal = None
+            if self.leases:
+                report = self.leases.write_report(self._stats_since(restored), self.metrics.state(), finished)
+
+        if not self.stats['total']:
+            print("✨ Nothing left to do for this shard" if self.leases else "❌ No images found!")
+        else:
+            # Print summary
+            self.print_summary()
+            self.write_metrics()
+        if self.leases:
+            print(f"🧩 Shard {self.shard[0]}/{self.shard[1]}: {self.leases.claimed} images claimed, "
+                  f"{self.leases.held_elsewhere} held by other workers, "
+                  f"{self.leases.taken_over} taken over from stopped ones")
+            print(f"📄 Report: {report}")
+            print("💡 When all shards are done: python organize_screenshots.py --merge-shards\n")
+
+        # If every image came from the caches the models were never needed;
+        # still let them finish loading so the interpreter doesn't shut down
+        # under the loader threads
+        for thread in self._model_loaders:
+            thread.join()
+
+    def ensure_models(self, ocr=None):
+        """
+        Reload the models if unload_models() dropped them (long-running modes)
+
+        ocr=True loads OCR in this process even with workers > 1, for
+        callers that don't go through the pipeline (see AsyncOrganizer).
+        """
+        self._last_activity = time.monotonic()
+        if not self.models_loaded:
+            self.initialize_models(ocr)
+
+    def unload_models(self, reason):
+        """
+        Drop CLIP and OCR from memory; they reload on the next image
+
+        Used by watch/serve mode after model_idle_unload_minutes without new
+        screenshots, or when the process grows past memory_limit_mb. The
+        caches (result cache, near-duplicate index, category embeddings on
+        disk) stay, so reloading is quick. The pipeline's OCR worker
+        processes hold a reader each, so they are stopped as well.
+        """
+        if not self.models_loaded:
+            return
         self.clip_model = None
         self.clip_processor = None
+        self.image_encoder = None
+        self.category_embeddings = None
         self.ocr_reader = None
+        self.shutdown_ocr_pool()
+        self.models_loaded = False
+        self.release_memory()
+        rss = self.current_rss_mb()
+        print(f"\n💤 Models unloaded ({reason}){f' - now {rss:.0f} MB' if rss else ''}. "
+              "They reload with the next screenshot.")
 
-    def load_config(self, config_path):
+    @staticmethod
+    def release_memory():
         """
-        Load configuration from file or use defaults
+        Hand freed memory back to the OS
 
-        The config file allows you to customize:
-        - Categories and their keywords
-        - Source/destination folders
-        - File naming and organization preferences
+        Collects Python garbage (image buffers, tensors from the last batch),
+        empties torch's CUDA cache and, on glibc, trims malloc's free lists.
+        Without the trim a long-running process keeps its peak size even
+        when idle.
         """
-        default_config = {
-            'source_folder': '.',
-            'destination_folder': './Organized_Screenshots',
-            'categories': {
-                'Code': ['code', 'terminal', 'programming', 'script', 'console', 'editor'],
-                'Documents': ['document', 'text', 'pdf', 'article', 'paper'],
-                'Memes': ['meme', 'funny', 'comic', 'joke'],
-                'Chats': ['chat', 'message', 'conversation', 'whatsapp', 'telegram'],
-                'Design': ['design', 'ui', 'mockup', 'figma', 'sketch'],
-                'Diagrams': ['diagram', 'chart', 'graph', 'flowchart', 'architecture'],
-                'Receipts': ['receipt', 'bill', 'invoice', 'payment'],
-                'Errors': ['error', 'exception', 'traceback', 'warning', 'failed']
-            },
-            'organize_by_date': True,
-            'rename_files': True,
-            'move_or_copy': 'move',
-            'image_extensions': ['.png', '.jpg', '.jpeg', '.gif', '.bmp'],
-            'min_confidence': 0.3
+        import gc
+        gc.collect()
+
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+        if sys.platform.startswith('linux'):
+            try:
+                import ctypes
+                ctypes.CDLL('libc.so.6').malloc_trim(0)
+            except (OSError, AttributeError):
+                pass
+
+    @staticmethod
+    def current_rss_mb():
+        """Current resident memory in MB (Linux), or None where it can't be read cheaply"""
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                pages = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+    def after_batch(self):
+        """
+        Memory housekeeping after each watch/serve batch
+
+        Releases what the batch left behind and unloads the models right
+        away if the process is still above memory_limit_mb. If the models
+        alone already took more than the limit right after loading, unloading
+        would only make the next batch load them again, so that is reported
+        once and the limit is no longer enforced.
+        """
+        self._last_activity = time.monotonic()
+        self.release_memory()
+
+        limit = self.config['memory_limit_mb']
+        rss = self.current_rss_mb()
+        if not (limit and rss and rss > limit) or self._memory_limit_too_low:
+            return
+        if self._loaded_rss and self._loaded_rss > limit:
+            self._memory_limit_too_low = True
+            print(f"\n⚠️  memory_limit_mb {limit} is below what the loaded models take "
+                  f"({self._loaded_rss:.0f} MB), so they stay loaded")
+            print(f"  💡 Set memory_limit_mb above {self._loaded_rss:.0f} (plus room for a batch) "
+                  "or use model_idle_unload_minutes")
+            return
+        self.unload_models(f"{rss:.0f} MB is above memory_limit_mb {limit}")
+
+    def unload_if_idle(self):
+        """Unload the models after model_idle_unload_minutes without new images"""
+        idle_minutes = self.config['model_idle_unload_minutes']
+        if idle_minutes and self.models_loaded and time.monotonic() - self._last_activity > idle_minutes * 60:
+            self.unload_models(f"idle for {idle_minutes} min")
+
+    def _shard_folder(self, source):
+        """Shared folder for leases and reports of a sharded run (default: inside the source folder)"""
+        folder = self.config.get('shard_folder') or os.path.join(source, '.screenshot_shards')
+        return Path(os.path.expanduser(folder))
+
+    def _stats_since(self, earlier):
+        """Statistics gathered since the earlier copy of self.stats"""
+        delta = {key: value - earlier[key] for key, value in self.stats.items() if key != 'categories'}
+        delta['categories'] = {
+            category: count - earlier['categories'].get(category, 0)
+            for category, count in self.stats['categories'].items()
+            if count != earlier['categories'].get(category, 0)
         }
+        return delta
 
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                user_config = json.load(f)
-                default_config.update(user_config)
+    def merge_shards(self, source_folder=None):
+        """
+        Combine the reports of a sharded run into one summary (--merge-shards)
+
+        Adds up the statistics and stage timings of every shard run (the
+        histograms merge exactly, so percentiles are those of the whole
+        job), prints the usual summary, writes metrics_file, and adds the
+        shards' embedding indexes to the main one. Throughput is measured
+        over the job's wall time, first shard start to last shard end. Once
+        every shard has finished, the shard folder is removed. Returns a
+        process exit code.
+        """
+        source = source_folder or self.config['source_folder']
+        folder = self._shard_folder(source)
+        reports = ShardLeases.read_reports(folder)
+        if not reports:
+            print(f"❌ No shard reports in {folder}")
+            print("💡 Run the shards first: python organize_screenshots.py --shard 0/N (1/N, ...)")
+            return 1
+
+        shard_counts = sorted({report['shard_count'] for report in reports})
+        if len(shard_counts) > 1:
+            print(f"❌ {folder} holds reports of different shard counts ({', '.join(map(str, shard_counts))})")
+            return 1
+        shard_count = shard_counts[0]
+
+        print(f"🧩 Merging {len(reports)} shard runs from {folder}\n")
+        print(f"  {'Shard':<7} {'Host':<20} {'Images':>7} {'Failed':>7} {'images/s':>9}  Status")
+        reports.sort(key=lambda report: (report['shard'], report['started']))
+        latest = {}
+        for report in reports:
+            seconds = report['finished'] - report['started']
+            rate = report['stats']['processed'] / seconds if seconds > 0 else 0.0
+            status = 'done' if report['complete'] else 'interrupted'
+            print(f"  {report['shard']:>2}/{shard_count:<4} {report['host'][:20]:<20} "
+                  f"{report['stats']['processed']:>7} {report['stats']['failed']:>7} {rate:>9.2f}  {status}")
+            latest[report['shard']] = report
+
+            for key, value in report['stats'].items():
+                if key == 'categories':
+                    for category, count in value.items():
+                        self.stats['categories'][category] = self.stats['categories'].get(category, 0) + count
+                else:
+                    self.stats[key] = self.stats.get(key, 0) + value
+            self.metrics.merge(report['metrics'])
+
+        self.metrics.wall_seconds = (max(report['finished'] for report in reports)
+                                     - min(report['started'] for report in reports))
+        self.print_summary()
+        self.write_metrics()
+        self.import_shard_embeddings(folder, {report['run'] for report in reports})
+
+        unfinished = [shard for shard in range(shard_count)
+                      if shard not in latest or not latest[shard]['complete']]
+        if unfinished:
+            print(f"⚠️  Not finished yet: shard {', '.join(f'{shard}/{shard_count}' for shard in unfinished)}")
+            print("💡 Run them (again) with --shard, then merge again")
+            return 1
+
+        shutil.rmtree(folder, ignore_errors=True)
+        print(f"🧹 All {shard_count} shards finished - removed {folder}")
+        return 0
+
+    def import_shard_embeddings(self, folder, runs):
+        """Add the embedding indexes of finished shard runs to the main index, then delete them"""
+        prefix = f"embeddings_{hashlib.sha1(self.config['clip_model'].encode('utf-8')).hexdigest()[:12]}."
+        for vectors_path in sorted(Path(folder).glob(f"{prefix}*.f16")):
+            base = vectors_path.with_suffix('')
+            if base.name[len(prefix):] not in runs:
+                continue  # still running, or never reported
+            self.open_embedding_index()
+            if not self.embedding_index:
+                return
+            try:
+                shard_index = EmbeddingIndex(base)
+                added = self.embedding_index.merge(shard_index)
+                shard_index.close()
+            except Exception as e:
+                print(f"  ⚠️  Could not add {base.name} to the embedding index: {e}")
+                continue
+            vectors_path.unlink()
+            Path(f"{base}.sqlite3").unlink(missing_ok=True)
+            print(f"  🧭 Added {added} images from {base.name} to the embedding index")
+
+    def _journal_path(self, source):
+        """Journal file for organizing source into the configured destination"""
+        key = json.dumps({
+            'source': os.path.realpath(source),
+            'destination': os.path.realpath(self.config['destination_folder']),
+            'mode': self.config['move_or_copy'],
+            **({'shard': list(self.shard)} if self.shard else {}),
+        }, sort_keys=True)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        return Path(self.config['cache_folder']) / f"journal_{digest}.jsonl"
+
+    def open_journal(self, source, resume=False):
+        """
+        Open the run journal (see Journal); with resume, pick up where an
+        interrupted run stopped and restore its statistics
+        """
+        if not self.config.get('journal') or not self.config.get('cache_folder'):
+            if resume:
+                print("⚠️  --resume needs journal and cache_folder enabled in config")
+            return
+
+        journal = Journal(self._journal_path(source))
+        try:
+            completed, rolled_back = journal.open(resume)
+        except Exception as e:
+            print(f"  ⚠️  Journal disabled: {e}")
+            return
+        self.journal = journal
+
+        if resume and not journal.done and not rolled_back:
+            print("💡 Nothing to resume - starting from the beginning\n")
+            return
+
+        for entry in journal.done.values():
+            self._count('total')
+            self._count('processed')
+            self._count('categories', entry['category'])
+
+        if resume:
+            print(f"♻️  Resuming: {len(journal.done)} images already organized "
+                  f"({completed} unfinished operations completed, {rolled_back} rolled back)\n")
+
+    def watch_mode(self, source_folder=None):
+        """
+        Watch folder and organize new images continuously
+
+        Reacts to filesystem events (inotify on Linux) through the optional
+        watchdog package, so new screenshots are organized within a second of
+        being saved and an idle folder costs no CPU. Without watchdog (or with
+        watch_events disabled) it falls back to checking the folder every
+        watch_interval seconds. New files are queued in a WatchScheduler, so a
+        bulk drop doesn't hold up a screenshot taken right after it.
+        Press Ctrl+C to stop watching
+        """
+        source = source_folder or self.config['source_folder']
+
+        print(f"\n👀 Starting watch mode...")
+        print(f"📂 Watching: {source}")
+        print(f"📂 Destination: {self.config['destination_folder']}")
+        print("Press Ctrl+C to stop\n")
+
+        # Initialize models
+        self.initialize_models()
+        self.metrics.restart()
+
+        workers = int(self.config.get('workers', 1))
+        batch_size = max(1, int(self.config.get('clip_batch_size', 1)))
+        self.watch_scheduler = WatchScheduler(self.config, self.metrics,
+                                              max(batch_size * 2, workers * 2) if workers > 1 else batch_size)
+
+        try:
+            if not (self.config['watch_events'] and self._watch_events(source)):
+                self._watch_polling(source)
+
+        except KeyboardInterrupt:
+            print("\n\n⏹️  Stopped watching")
+            self.print_summary()
+            self.write_metrics()
+
+    def _watch_events(self, source):
+        """
+        Event-driven watch loop; returns False if watchdog isn't installed
+
+        Files are queued on create/modify/close-write/moved-in events and
+        organized once they've been quiet for watch_debounce_seconds, so
+        screenshots that are still being written aren't picked up half-done.
+        A close-after-write event means the writer is finished, so those
+        files only wait a short moment. Deleted or moved-away files are
+        dropped from the queue.
+        """
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            print("  💡 Install watchdog for instant reactions: pip install watchdog")
+            print(f"  ⏱️  Falling back to checking every {self.config['watch_interval']} seconds\n")
+            return False
+
+        source_dir = os.path.abspath(source)
+        recursive = self.config['recursive']
+        is_candidate = self._watch_filter(source)
+        debounce = self.config['watch_debounce_seconds']
+        pending = {}  # path -> monotonic time when it's ready to process
+        pending_lock = threading.Lock()
+
+        def queue_file(path, delay):
+            if is_candidate(path):
+                with pending_lock:
+                    pending[path] = time.monotonic() + delay
+
+        def forget_file(path):
+            with pending_lock:
+                pending.pop(path, None)
+
+        class NewScreenshotHandler(FileSystemEventHandler):
+            def on_created(self, event):
+                if not event.is_directory:
+                    queue_file(event.src_path, debounce)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    queue_file(event.src_path, debounce)
+
+            def on_closed(self, event):
+                # Writer closed the file - it's complete
+                if not event.is_directory:
+                    queue_file(event.src_path, min(debounce, 0.05))
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    forget_file(event.src_path)
+                    queue_file(event.dest_path, min(debounce, 0.05))
+
+            def on_deleted(self, event):
+                forget_file(event.src_path)
+
+        observer = Observer()
+        observer.schedule(NewScreenshotHandler(), source_dir, recursive=recursive)
+        observer.start()
+        print("  ⚡ Watching for filesystem events\n")
+
+        def refill():
+            now = time.monotonic()
+            with pending_lock:
+                ready = [path for path, ready_at in pending.items() if ready_at <= now]
+                for path in ready:
+                    del pending[path]
+            self._queue_new_images([path for path in ready if os.path.isfile(path)])
+
+        try:
+            self._run_watch_queue(refill)
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _watch_filter(self, source):
+        """Function telling whether a file event in source is about an image to organize"""
+        source_dir = os.path.abspath(source)
+        extensions = {ext.lower() for ext in self.config['image_extensions']}
+        recursive = self.config['recursive']
+        excluded = self._excluded_folders()
+
+        def is_candidate(path):
+            if os.path.splitext(path)[1].lower() not in extensions:
+                return False
+            folder = os.path.dirname(os.path.abspath(path))
+            if not recursive:
+                return folder == source_dir
+            folder = os.path.realpath(folder)
+            return not any(folder == skip or folder.startswith(skip + os.sep) for skip in excluded)
+
+        return is_candidate
+
+    def _watch_polling(self, source):
+        """
+        Polling watch loop: re-scan the folder every watch_interval seconds
+
+        Images already in the folder when watching starts are left alone.
+        The set of known files is trimmed to what's still in the folder on
+        every scan, so it doesn't grow with every screenshot ever organized.
+        """
+        # Track processed files
+        processed_files = set(str(p) for p in self.find_images(source))
+        next_scan = time.monotonic() + self.config['watch_interval']
+
+        def refill():
+            nonlocal processed_files, next_scan
+            if time.monotonic() < next_scan:
+                return
+            current_images = set(str(p) for p in self.find_images(source))
+            self._queue_new_images(sorted(current_images - processed_files))
+
+            # Files that were moved away no longer need tracking
+            processed_files = current_images
+            next_scan = time.monotonic() + self.config['watch_interval']
+
+        self._run_watch_queue(refill)
+
+    def _queue_new_images(self, paths):
+        """Hand ready files to the watch scheduler"""
+        fast, bulk = self.watch_scheduler.add(paths)
+        if fast or bulk:
+            lanes = ', '.join(f"{count} {lane} lane" for lane, count in (('fast', fast), ('bulk', bulk)) if count)
+            print(f"\n🆕 Found {fast + bulk} new image(s) ({lanes})")
+
+    def _run_watch_queue(self, refill):
+        """
+        Organize queued files in the order the watch scheduler picks
+
+        refill() moves files that became ready into the scheduler. The
+        serial path takes one chunk at a time (the fast lane, or as many
+        bulk files as the scheduler allows) and checks for new files in
+        between. The pipeline pulls files from the scheduler one by one
+        until the queue is empty. Memory housekeeping runs once the queue
+        has drained, not after every chunk. With workers > 1 the OCR worker
+        processes stay up between drains (see ocr_worker_pool), so a fast-lane
+        file never waits for them to start.
+        """
+        scheduler = self.watch_scheduler
+        workers = self._workers()
+
+        while True:
+            refill()
+            if scheduler.waiting():
+                self.ensure_models()
+                try:
+                    if workers > 1:
+                        self.organize_pipeline(scheduler.stream(refill), workers, scheduler.finished)
+                    else:
+                        self.organize_batch(scheduler.take(), on_result=scheduler.finished)
+                finally:
+                    scheduler.requeue_unfinished()
+                if not scheduler.waiting():
+                    self.after_batch()
+            else:
+                time.sleep(0.1)
+                self.unload_if_idle()
+            self.write_metrics(periodic=True)
+
+    def serve(self, socket_path=None):
+        """
+        Warm-start daemon: load the models once and take jobs over a Unix socket
+
+        Loading CLIP + EasyOCR takes several seconds. Hooks that run once per
+        upload shouldn't pay that every time, so --serve keeps the models in
+        memory and waits for "organize this file/folder" requests from
+        --submit clients. Each request streams back one JSON line per file
+        and a final summary line. Jobs run one at a time in arrival order.
+        With workers > 1 the OCR worker processes also start once and serve
+        every job (see ocr_worker_pool) until the daemon stops or the models
+        are unloaded.
+        Press Ctrl+C to stop the daemon.
+        """
+        import socketserver
+
+        socket_path = os.path.expanduser(socket_path or self.config['socket_path'])
+        self._remove_stale_socket(socket_path)
+
+        print("\n🛰️  Starting organizer daemon...")
+        print(f"📂 Destination: {self.config['destination_folder']}")
+
+        # Initialize models once for every job
+        self.initialize_models()
+
+        organizer = self
+        job_lock = threading.Lock()
+
+        class JobHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                connected = [True]
+
+                def send(message):
+                    # A client that hung up shouldn't abort the job
+                    if not connected[0]:
+                        return
+                    try:
+                        self.wfile.write((json.dumps(message) + '\n').encode('utf-8'))
+                        self.wfile.flush()
+                    except OSError:
+                        connected[0] = False
+
+                try:
+                    request = json.loads(self.rfile.readline().decode('utf-8'))
+                except ValueError:
+                    send({'done': True, 'error': 'invalid request (expected one JSON line)'})
+                    return
+
+                with job_lock:
+                    organizer.handle_job(request, send)
+
+        class JobServer(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+            def service_actions(self):
+                # Runs between requests in serve_forever's loop
+                if job_lock.acquire(blocking=False):
+                    try:
+                        organizer.unload_if_idle()
+                    finally:
+                        job_lock.release()
+
+        server = JobServer(socket_path, JobHandler)
+        os.chmod(socket_path, 0o600)
+        print(f"🔌 Listening on {socket_path}")
+        print("Press Ctrl+C to stop\n")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n\n⏹️  Daemon stopped")
+            self.print_summary()
+        finally:
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.cleanup()
 
-        return default_config
+    def handle_job(self, request, send):
+        """
+        Run one daemon request and stream its results through send()
 
-    def initialize_models(self):
+        Request:  {"action": "organize", "path": "/abs/file/or/folder"}
+        Replies:  one result dict per file (see organize_file), then
+                  {"done": true, "processed": N, "failed": M}
         """
-        Initialize CLIP and OCR models (lazy loading)
+        action = request.get('action', 'organize')
+        path = request.get('path')
 
-        CLIP: Vision-language model that understands image content
-        OCR: Optical Character Recognition to extract text from images
+        if action != 'organize':
+            send({'done': True, 'error': f"unknown action: {action}"})
+            return
+        if not path or not os.path.exists(path):
+            send({'done': True, 'error': f"path not found: {path}"})
+            return
 
-        Models are loaded only when needed (lazy loading) to save memory
-        """
-        print("🔄 Loading AI models...")
+        print(f"\n📥 Job: {path}")
+        self.ensure_models()
+        images = [path] if os.path.isfile(path) else self.find_images(path)
+        counts = {'ok': 0, 'error': 0}
+
+        def on_result(result):
+            counts[result['status']] += 1
+            send(result)
+
+        self.organize_images(images, on_result=on_result)
+        send({'done': True, 'processed': counts['ok'], 'failed': counts['error']})
+        self.after_batch()
+        self.write_metrics()
+
+    @staticmethod
+    def _remove_stale_socket(socket_path):
+        """Delete a leftover socket file, refusing to start if a daemon is still using it"""
+        import socket
 
+        if not os.path.exists(socket_path):
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         try:
-            # Load CLIP
-            from transformers import CLIPProcessor, CLIPModel
-            import torch
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+        finally:
+            probe.close()
 
-            print("  📦 Loading CLIP model...")
-            self.clip_model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32")
-            self.clip_processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+        print(f"❌ Another organizer daemon is already listening on {socket_path}")
+        sys.exit(1)
 
-            # Move to GPU if available
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            self.clip_model.to(self.device)
-            print(f"  ✅ CLIP loaded on {self.device}")
+    def write_metrics(self, periodic=False):
+        """
+        Write the current metrics snapshot to metrics_file, if configured
 
-        except Exception as e:
-            print(f"  ⚠️  CLIP loading failed: {e}")
-            print("  💡 Install with: pip install transformers torch pillow")
-            self.clip_model = None
+        metrics_format is 'json' or 'prometheus' (text exposition format,
+        e.g. for node_exporter's textfile collector). The file is replaced
+        atomically, so readers never see a half-written report. With
+        periodic=True (watch mode) it is rewritten at most every
+        metrics_interval seconds.
+        """
+        path = self.config.get('metrics_file')
+        if not path:
+            return
+        if self.shard:
+            # Shards of one job may share the file system; each gets its own file
+            base, ext = os.path.splitext(path)
+            path = f"{base}.shard-{self.shard[0]}-of-{self.shard[1]}{ext}"
+        if periodic and time.monotonic() - self._metrics_written < self.config['metrics_interval']:
+            return
+        self._metrics_written = time.monotonic()
+
+        snapshot = self.metrics.snapshot(self.stats)
+        if self.config['metrics_format'] == 'prometheus':
+            content = Metrics.to_prometheus(snapshot)
+        else:
+            content = json.dumps(snapshot, indent=2) + '\n'
 
         try:
-            # Load OCR
-            import easyocr
-            print("  📦 Loading OCR model...")
-            self.ocr_reader = easyocr.Reader(['en'], gpu=torch.cuda.is_available())
-            print("  ✅ OCR loaded")
+            path = Path(os.path.expanduser(path))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(path.name + '.tmp')
+            temp_path.write_text(content, encoding='utf-8')
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"  ⚠️  Could not write metrics to {path}: {e}")
 
-        except Exception as e:
-            print(f"  ⚠️  OCR loading failed: {e}")
-            print("  💡 Install with: pip install easyocr")
-            self.ocr_reader = None
+    def encode_text_query(self, text):
+        """Normalized CLIP text embedding of a search query (loads only the text half of CLIP)"""
+        import torch
+        from transformers import AutoTokenizer, CLIPTextModelWithProjection
 
-        if not self.clip_model and not self.ocr_reader:
-            print("\n❌ No AI models loaded. Please install dependencies.")
-            sys.exit(1)
+        model = self._load_clip_tower(CLIPTextModelWithProjection, 'text_config').eval()
+        tokenizer = AutoTokenizer.from_pretrained(self.config['clip_model'])
+        inputs = tokenizer([text], padding=True, truncation=True, return_tensors='pt')
+        with torch.no_grad():
+            features = model(**inputs).text_embeds
+        features = features / features.norm(dim=-1, keepdim=True)
+        return features[0].numpy()
 
-    def extract_text_ocr(self, image_path):
+    def search(self, text=None, image_path=None, top_k=10):
         """
-        Extract text from image using OCR (Optical Character Recognition)
+        Find organized screenshots by meaning (--search) or by look (--similar)
 
-        This helps identify screenshots with text content like:
-        - Code snippets
-        - Error messages
-        - Chat conversations
-        - Documents
+        The query is scored against every image in the embedding index; no
+        model runs over the library. A text query only loads the text half of
+        CLIP, and an image that is already indexed is looked up by content
+        without any model. Returns a process exit code.
         """
-        if not self.ocr_reader:
-            return ""
+        import numpy as np
 
+        self.open_embedding_index()
+        index = self.embedding_index
+        if not index or not index.count:
+            print("❌ The embedding index is empty - organize some screenshots first")
+            print("💡 It's filled while organizing with \"embedding_index\": true (the default)")
+            return 1
+
+        exclude_row = None
         try:
-            result = self.ocr_reader.readtext(str(image_path), detail=0)
-            text = ' '.join(result).lower()
-            return text
+            if text:
+                print(f"🔎 Searching {index.count} screenshots for \"{text}\"...")
+                query = self.encode_text_query(text)
+            else:
+                print(f"🔎 Looking for screenshots similar to {image_path}...")
+                record = ImageRecord.load(image_path, compute_hash=True)
+                exclude_row = index.find(record.content_hash)
+                if exclude_row is not None:
+                    query = np.asarray(index.vectors()[exclude_row], dtype=np.float32)
+                else:
+                    self.load_clip_model()
+                    if not self.clip_model:
+                        return 1
+                    query = self._clip_image_features([record.image])[0].float().cpu().numpy()
         except Exception as e:
-            print(f"    ⚠️  OCR failed: {e}")
-            return ""
+            print(f"❌ Could not encode the query: {e}")
+            return 1
+
+        start = time.perf_counter()
+        results = index.search(query, top_k, exclude_row)
+        elapsed = time.perf_counter() - start
 
-    def classify_with_clip(self, image_path):
+        print(f"\n{len(results)} best matches of {index.count} screenshots ({elapsed * 1000:.1f} ms):\n")
+        for rank, result in enumerate(results, 1):
+            missing = '' if os.path.exists(result['path']) else '  (moved or deleted)'
+            print(f"{rank:>3}. {result['score']:.3f}  [{result['category']}]  {result['path']}{missing}")
+        return 0
+
+    def reclassify(self, dry_run=False):
         """
-        Classify image using CLIP (Contrastive Language-Image Pre-training)
+        Re-categorize organized screenshots for the current config (--reclassify)
 
-        CLIP understands visual content and matches it with text descriptions
-        Returns the best matching category and confidence score (0.0 to 1.0)
+        After changing categories, keywords or min_confidence, recomputes
+        every indexed screenshot's category from its stored CLIP embedding
+        and OCR text - no OCR or image model runs. The new category prompts
+        are encoded once (or come from the text embedding cache), all images
+        are scored in one pass (see EmbeddingIndex.category_probabilities
+        and combine_many), and only files whose category changed are moved.
+        With dry_run, the changes are listed but nothing is moved. Returns a
+        process exit code.
+
+        Screenshots that were placed without CLIP (result cache hits,
+        near-duplicates, an OCR-only cascade) get their embedding computed
+        first (see index_pending); that's the only time the image model
+        runs. Screenshots in the destination the index doesn't know at all
+        are counted and reported. Near-duplicates routed to
+        near_duplicate_folder are left there.
         """
-        if not self.clip_model:
-            return None, 0.0
+        self.open_embedding_index()
+        index = self.embedding_index
+        pending = index.pending() if index else []
+        if not index or not (index.count or pending):
+            print("❌ The embedding index is empty - organize some screenshots first")
+            print("💡 It's filled while organizing with \"embedding_index\": true (the default)")
+            return 1
 
         try:
-            from PIL import Image
-            import torch
-
-            image = Image.open(image_path).convert('RGB')
+            self.device = 'cpu'
+            if pending:
+                # The image tower is needed for them anyway
+                self.load_clip_model()
+                if self.clip_model is None:
+                    return 1
+            elif not self.load_cached_category_embeddings():
+                # Encodes the new prompts and caches them for the next runs
+                self.load_clip_model()
+                if self.category_embeddings is None:
+                    return 1
+            category_embeddings = self.category_embeddings.float().cpu().numpy()
+            # (an index with only pending images gets its dimensions from this model)
+            if index.dim is not None and category_embeddings.shape[1] != index.dim:
+                print(f"❌ The index holds {index.dim}-dimensional embeddings, "
+                      f"{self.config['clip_model']} makes {category_embeddings.shape[1]}")
+                return 1
+        except Exception as e:
+            print(f"❌ Could not encode the categories: {e}")
+            return 1
 
-            # Create text prompts for each category
-            categories = list(self.config['categories'].keys())
-            texts = [f"a screenshot of {cat.lower()}" for cat in categories]
+        not_indexed = self.index_pending(pending) if pending else 0
+        not_indexed += self._count_unindexed(index)
+        print(f"🔄 Re-classifying {index.count} screenshots for {len(self.config['categories'])} categories...")
 
-            inputs = self.clip_processor(
-                text=texts,
-                images=image,
-                return_tensors="pt",
-                padding=True
-            )
+        start = time.perf_counter()
+        entries = index.entries()
+        probabilities = index.category_probabilities(category_embeddings, self.clip_logit_scale)
+        categories = self.combine_many([entry['ocr_text'] for entry in entries], probabilities)
+        # Near-duplicates routed to near_duplicate_folder aren't in a category
+        # combine_many could pick; they stay where they were routed to
+        duplicates = self.config.get('near_duplicate_folder') or None
+        changes = [(entry, category) for entry, category in zip(entries, categories)
+                   if category != entry['category'] and entry['category'] != duplicates]
+        elapsed = time.perf_counter() - start
+        print(f"  ✅ Scored in {elapsed * 1000:.0f} ms: {len(changes)} of {len(entries)} change category")
 
-            # Move to device
-            inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        moved, missing, failed = Counter(), 0, 0
+        emptied = set()
+        for entry, category in changes:
+            old_path = entry['path']
+            if not os.path.exists(old_path):
+                missing += 1
+                continue
 
-            with torch.no_grad():
-                outputs = self.clip_model(**inputs)
-                logits_per_image = outputs.logits_per_image
-                probs = logits_per_image.softmax(dim=1)
+            transition = f"{entry['category']} → {category}"
+            if dry_run:
+                print(f"  {transition}: {old_path}")
+                moved[transition] += 1
+                continue
 
-            # Get best match
-            confidence, idx = probs[0].max(0)
-            category = categories[idx.item()]
+            dest_path = None
+            try:
+                dest_base = self._destination_folder(old_path, category)
+                dest_path = self.placement.reserve(dest_base, self.generate_filename(old_path, category, entry['ocr_text']))
+                self.placement.transfer(old_path, dest_path, 'move', os.stat(old_path))
+                index.update(entry['content_hash'], os.path.abspath(dest_path), category)
+            except Exception as e:
+                if dest_path and not os.path.exists(dest_path):
+                    self.placement.release(dest_path)
+                print(f"  ❌ Could not move {old_path}: {e}")
+                failed += 1
+                continue
+            moved[transition] += 1
+            emptied.add(os.path.dirname(old_path))
 
-            return category, confidence.item()
+        # Drop date/category folders the moves left empty
+        destination = os.path.abspath(self.config['destination_folder'])
+        for folder in sorted(emptied, key=len, reverse=True):
+            while folder.startswith(destination + os.sep):
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    break
+                folder = os.path.dirname(folder)
 
-        except Exception as e:
-            print(f"    ⚠️  CLIP failed: {e}")
-            return None, 0.0
+        if moved:
+            verb = 'Would move' if dry_run else 'Moved'
+            print(f"\n{verb} {sum(moved.values())} screenshots:")
+            for transition, count in moved.most_common():
+                print(f"  {transition}: {count}")
+        else:
+            print("\n✨ Every screenshot is already in the right category")
+        if missing:
+            print(f"⚠️  {missing} indexed screenshots are no longer where they were organized to (skipped)")
+        if not_indexed:
+            print(f"⚠️  {not_indexed} screenshots in the destination aren't in the embedding index "
+                  "and were left where they are")
+            print("💡 Organize them again (e.g. move them back to the source folder) to re-sort them too")
+        if failed:
+            print(f"❌ {failed} screenshots could not be moved")
+        return 1 if failed else 0
 
-    def determine_category(self, image_path):
+    def index_pending(self, pending):
         """
-        Determine category using OCR + CLIP (hybrid approach)
+        Compute and index the embeddings of pending screenshots (see EmbeddingIndex.add_pending)
 
-        Strategy:
-        1. OCR extracts text and matches keywords from config.json
-        2. CLIP analyzes visual content
-        3. Combine both results for best accuracy:
-           - If both agree → use that category
-           - If OCR finds specific keywords → trust OCR (more precise)
-           - If CLIP has high confidence → trust CLIP
-           - Otherwise → mark as Uncategorized
+        Runs the CLIP image tower in clip_batch_size batches; the OCR text
+        and category noted when each was placed are kept. Entries whose
+        file is gone are dropped. Returns how many couldn't be indexed.
         """
-        print(f"  🔍 Analyzing: {os.path.basename(image_path)}")
+        index = self.embedding_index
+        batch_size = max(1, int(self.config.get('clip_batch_size', 1)))
+        present, gone = [], []
+        for entry in pending:
+            (present if os.path.isfile(entry['path']) else gone).append(entry)
+        index.drop_pending([entry['content_hash'] for entry in gone])
+        if not present:
+            return 0
 
-        # Step 1: Extract text with OCR
-        ocr_text = self.extract_text_ocr(image_path)
-        ocr_category = None
+        print(f"🧮 Computing embeddings for {len(present)} screenshots organized without CLIP...")
+        failed = 0
+        for start in range(0, len(present), batch_size):
+            batch = []
+            for entry in present[start:start + batch_size]:
+                try:
+                    batch.append((entry, self.load_record(entry['path'])))
+                except OSError as e:
+                    print(f"  ⚠️  Could not read {entry['path']}: {e}")
+                    failed += 1
+            if not batch:
+                continue
+            try:
+                features = self._clip_image_features([record.image for _, record in batch])
+                for (entry, record), vector in zip(batch, features.float().cpu().numpy()):
+                    index.add(vector, entry['content_hash'], entry['path'], entry['category'], entry['ocr_text'])
+                    record.release()
+            except Exception as e:
+                print(f"  ⚠️  Could not compute embeddings: {e}")
+                failed += len(batch)
+        return failed
 
-        if ocr_text:
-            print(f"    📝 OCR text: {ocr_text[:100]}...")
-            # Match keywords from config.json categories
-            for category, keywords in self.config['categories'].items():
-                if any(keyword in ocr_text for keyword in keywords):
-                    ocr_category = category
-                    print(f"    🎯 OCR suggests: {category}")
-                    break
+    def _count_unindexed(self, index):
+        """Images under the destination folder that are neither indexed nor pending"""
+        known = {entry['path'] for entry in index.entries()}
+        known.update(entry['path'] for entry in index.pending())
+        extensions = {ext.lower() for ext in self.config['image_extensions']}
+        count = 0
+        for folder, _, files in os.walk(os.path.abspath(self.config['destination_folder'])):
+            for name in files:
+                if os.path.splitext(name)[1].lower() in extensions and os.path.join(folder, name) not in known:
+                    count += 1
+        return count
 
-        # Step 2: Classify with CLIP (visual analysis)
-        clip_category, confidence = self.classify_with_clip(image_path)
+    def print_summary(self):
+        """Print organization summary"""
+        print("\n" + "="*50)
+        print("📊 ORGANIZATION SUMMARY")
+        print("="*50)
+        print(f"Total images found: {self.stats['total']}")
+        print(f"Successfully processed: {self.stats['processed']}")
+        print(f"Failed: {self.stats['failed']}")
+        if self.result_cache:
+            print(f"Cache: {self.result_cache.hits} hits, {self.result_cache.misses} misses")
+        if self.near_duplicates:
+            print(f"Near-duplicates (models skipped): {self.stats['near_duplicates']}")
+        if self.stats['ocr_skipped'] or self.stats['ocr_no_regions']:
+            print(f"OCR skipped (no text): {self.stats['ocr_skipped']} by quick check, "
+                  f"{self.stats['ocr_no_regions']} by text detector")
+        if self.config['cascade'] != 'off':
+            print(f"Cascade: {self.stats['cascade_ocr_only']} OCR only, "
+                  f"{self.stats['cascade_clip_only']} CLIP only, {self.stats['cascade_both']} both models")
+            if self.stats['cascade_audited']:
+                print(f"Cascade audit: {self.stats['cascade_audit_changed']} of "
+                      f"{self.stats['cascade_audited']} audited images would differ from running both models")
+            if self.model_latency:
+                latencies = ', '.join(f"{model.upper()} {seconds:.2f}s"
+                                      for model, seconds in sorted(self.model_latency.items()))
+                print(f"Per-image model time: {latencies}")
+        if self.watch_scheduler:
+            for line in self.watch_scheduler.summary():
+                print(line)
+        print("\n📁 Categories:")
+        for category, count in sorted(self.stats['categories'].items()):
+            print(f"  {category}: {count}")
 
-        if clip_category:
-            print(f"    🤖 CLIP suggests: {clip_category} (confidence: {confidence:.2f})")
+        snapshot = self.metrics.snapshot(self.stats)
+        if snapshot['stages']:
+            print("\n⏱️  Stage timings (ms):")
+            print(f"  {'Stage':<22} {'Count':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+            for name, stage in snapshot['stages'].items():
+                print(f"  {name:<22} {stage['count']:>6} {stage['p50_seconds'] * 1000:>8.1f} "
+                      f"{stage['p95_seconds'] * 1000:>8.1f} {stage['p99_seconds'] * 1000:>8.1f}")
+            line = (f"  {snapshot['images_per_second']:.2f} images/s, "
+                    f"{snapshot['bytes_read'] / 1e6:.1f} MB read")
+            if snapshot['first_result_seconds'] is not None:
+                line += f", first image done after {snapshot['first_result_seconds']:.1f}s"
+            if snapshot['peak_rss_bytes']:
+                line += f", peak memory {snapshot['peak_rss_bytes'] / 1e6:.0f} MB"
+            print(line)
+        print("="*50 + "\n")
 
-        # Step 3: Combine results intelligently
-        if ocr_category and clip_category:
-            # Both models have opinions
-            if ocr_category == clip_category:
-                # Both agree - high confidence!
-                final_category = ocr_category
-            elif confidence < 0.5:
-                # CLIP not confident, trust OCR keywords
-                final_category = ocr_category
-            else:
-                # CLIP is confident, trust it
-                final_category = clip_category
-        elif ocr_category:
-            # Only OCR found something
-            final_category = ocr_category
-        elif clip_category and confidence > self.config['min_confidence']:
-            # Only CLIP found something with good confidence
-            final_category = clip_category
-        else:
-            # Neither model is confident
-            final_category = 'Uncategorized'
 
-        print(f"    ✅ Final category: {final_category}")
-        return final_category, ocr_text
+class AsyncOrganizer:
+    """
+    asyncio front end to a ScreenshotOrganizer, for async services
 
-    def generate_filename(self, original_path, category, ocr_text):
-        """
-        Generate descriptive filename based on content
+    organize_file() and organize_stream() never block the event loop. Each
+    stage runs in a thread pool behind its own semaphore (see
+    DEFAULT_LIMITS): reading and decoding, OCR, CLIP, and placing the file
+    (keyword fusion, caches, move/copy). So one file can be read while
+    another is in OCR and a third is being moved. OCR and CLIP of the same
+    image run side by side. Images that wait for CLIP together are
+    classified in one batch once the stage is free.
 
-        If rename_files is enabled in config:
-        - Extracts meaningful words from OCR text
-        - Adds date from file metadata
-        - Creates readable filename like: python_error_traceback_2025-12-05.png
+    Cancelling a call stops its file at the next stage boundary. A step
+    that already started (e.g. a move) still runs to the end and keeps its
+    slot until then, so no file is ever half-moved and the limits hold.
 
-        Otherwise keeps original filename
-        """
-        if not self.config['rename_files']:
-            return os.path.basename(original_path)
+        async with AsyncOrganizer(ScreenshotOrganizer('config.json')) as organizer:
+            result = await organizer.organize_file('shot.png')
+            async for result in organizer.watch('~/Desktop'):
+                ...
+    """
 
-        # Extract date from original filename or use file modification time
-        original_name = os.path.basename(original_path)
-        file_ext = os.path.splitext(original_name)[1]
+    # Concurrent steps per stage; OCR and CLIP already use every core each
+    DEFAULT_LIMITS = {'load': 4, 'ocr': 1, 'clip': 1, 'place': 4}
 
-        # Get file date
-        mod_time = os.path.getmtime(original_path)
-        date_str = datetime.fromtimestamp(mod_time).strftime('%Y-%m-%d')
+    def __init__(self, organizer, limits=None, max_in_flight=None):
+        from concurrent.futures import ThreadPoolExecutor
 
-        # Generate descriptive part from OCR text
-        if ocr_text:
-            # Extract meaningful words (simple approach)
-            words = ocr_text.split()[:5]  # First 5 words
-            desc = '_'.join(w for w in words if len(w) > 3)[:30]  # Max 30 chars
-            desc = ''.join(c if c.isalnum() or c == '_' else '_' for c in desc)
-        else:
-            desc = category.lower()
+        self.organizer = organizer
+        self.limits = dict(self.DEFAULT_LIMITS, **(limits or {}))
+        self.max_in_flight = max_in_flight or 2 * sum(self.limits.values())
+        self._executor = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix='async')
+        # asyncio objects are created in the running loop (see _setup)
+        self._semaphores = None
+        self._models_lock = None
+        self._caches_open = False
+        self._clip_waiting = []  # (record, future) waiting for a CLIP batch
 
-        new_name = f"{desc}_{date_str}{file_ext}"
+    def _setup(self):
+        import asyncio
 
-        # Ensure unique filename
-        return new_name
+        if self._semaphores is None:
+            self._semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in self.limits.items()}
+            self._models_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self._open_caches()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
 
-    def organize_file(self, image_path):
+    async def close(self):
+        """Wait for running steps, then stop the thread pool and write the metrics file"""
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.organizer.write_metrics()
+
+    async def _stage(self, stage, func, *args):
+        """Run func in the thread pool once stage has a free slot; the slot is held until func returns"""
+        import asyncio
+
+        semaphore = self._semaphores[stage]
+        await semaphore.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        def finished(future):
+            semaphore.release()
+            if not future.cancelled():
+                future.exception()  # retrieved, even if nobody awaits it any more
+
+        future.add_done_callback(finished)
+        # shield: a cancelled caller doesn't abandon a step that is running
+        return await asyncio.shield(future)
+
+    async def _open_caches(self):
         """
-        Organize a single file through the complete pipeline:
-        1. Analyze and categorize
-        2. Create destination folder structure
-        3. Generate new filename (if enabled)
-        4. Move or copy file
-        5. Update statistics
+        Open the caches and indexes before the first file is read
+
+        load_record only hashes files when a cache is open, and the load
+        stage looks results up in them, so this can't wait for the models.
         """
-        try:
-            self.stats['total'] += 1
+        import asyncio
 
-            # Determine category
-            category, ocr_text = self.determine_category(image_path)
+        self._setup()
+        if self._caches_open:
+            return
+        async with self._models_lock:
+            if not self._caches_open:
+                await asyncio.get_running_loop().run_in_executor(None, self.organizer.open_caches)
+                self._caches_open = True
 
-            # Update stats
-            self.stats['categories'][category] = self.stats['categories'].get(category, 0) + 1
+    async def _models(self):
+        """Load the models (again, after unload_models) without blocking the loop"""
+        import asyncio
 
-            # Create destination path
-            dest_base = Path(self.config['destination_folder']) / category
+        if self.organizer.models_loaded:
+            return
+        async with self._models_lock:
+            try:
+                # OCR runs in this process here, never in the pipeline's workers
+                await asyncio.get_running_loop().run_in_executor(None, self.organizer.ensure_models, True)
+            except SystemExit:
+                raise RuntimeError("No AI models could be loaded")
 
-            if self.config['organize_by_date']:
-                mod_time = os.path.getmtime(image_path)
-                date_folder = datetime.fromtimestamp(mod_time).strftime('%Y-%m')
-                dest_base = dest_base / date_folder
+    async def _classify(self, record):
+        """CLIP result for one image; images waiting at the same time share one batch"""
+        import asyncio
 
-            dest_base.mkdir(parents=True, exist_ok=True)
+        future = asyncio.get_running_loop().create_future()
+        self._clip_waiting.append((record, future))
+        semaphore = self._semaphores['clip']
+        try:
+            while not future.done():
+                await semaphore.acquire()
+                if future.done():
+                    semaphore.release()
+                    break
+                self._start_clip_batch(semaphore)
+            return future.result()
+        finally:
+            if not future.done():
+                future.cancel()  # leave it out of later batches
 
-            # Generate filename
-            new_filename = self.generate_filename(image_path, category, ocr_text)
-            dest_path = dest_base / new_filename
+    def _start_clip_batch(self, semaphore):
+        """Classify the oldest waiting images in the thread pool; releases semaphore when done"""
+        import asyncio
 
-            # Handle duplicate filenames
-            counter = 1
-            while dest_path.exists():
-                name, ext = os.path.splitext(new_filename)
-                dest_path = dest_base / f"{name}_{counter}{ext}"
-                counter += 1
+        batch = []
+        batch_size = max(1, int(self.organizer.config.get('clip_batch_size', 1)))
+        while self._clip_waiting and len(batch) < batch_size:
+            record, future = self._clip_waiting.pop(0)
+            if not future.done():
+                batch.append((record, future))
+        if not batch:
+            semaphore.release()
+            return
 
-            # Move or copy file
-            if self.config['move_or_copy'] == 'move':
-                shutil.move(str(image_path), str(dest_path))
-                print(f"    📦 Moved to: {dest_path}")
+        def deliver(run):
+            semaphore.release()
+            if run.cancelled() or run.exception():
+                print(f"    ⚠️  CLIP batch failed: {'cancelled' if run.cancelled() else run.exception()}")
+                results = [(None, 0.0)] * len(batch)
             else:
-                shutil.copy2(str(image_path), str(dest_path))
-                print(f"    📦 Copied to: {dest_path}")
+                results = run.result()
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+        run = asyncio.get_running_loop().run_in_executor(self._executor, self._clip_batch,
+                                                          [record for record, _ in batch])
+        run.add_done_callback(deliver)
+
+    def _clip_batch(self, records):
+        organizer = self.organizer
+        if not organizer.clip_model:
+            return [(None, 0.0)] * len(records)
+        start = time.perf_counter()
+        results = organizer.classify_batch_with_clip(records)
+        organizer._record_latency('clip', (time.perf_counter() - start) / len(records), len(records))
+        return results
 
-            self.stats['processed'] += 1
+    def _load(self, path):
+        """Stage 'load': read and hash the file; answer from the caches or decode it for the models"""
+        organizer = self.organizer
+        record = organizer.load_record(path)
+        known = organizer.known_result(record)
+        if known:
+            return record, known[:2]
+
+        record.array
+        return record, None
+
+    def _ocr(self, record):
+        organizer = self.organizer
+        return organizer._timed('ocr', organizer.extract_text_ocr, record) if organizer.ocr_reader else ""
+
+    def _place(self, record, category, ocr_text, clip_result=None):
+        """
+        Stage 'place': fuse the model results (if any), update the caches and move/copy the file
 
+        Returns the file's result dict; from here on the file counts in the statistics.
+        """
+        organizer = self.organizer
+        organizer._count('total')
+        try:
+            if clip_result is not None:
+                category, _ = organizer.remember_result(record, ocr_text, clip_result)
+            dest_path = organizer.place_file(record, category, ocr_text)
         except Exception as e:
-            print(f"    ❌ Error: {e}")
-            self.stats['failed'] += 1
+            organizer._count('failed')
+            return organizer._file_result(record.path, error=e)
+        return organizer._file_result(record.path, category=category, destination=dest_path)
 
-    def find_images(self, folder):
-        """Find all image files in folder"""
-        images = []
-        folder_path = Path(folder)
+    async def organize_file(self, path):
+        """
+        Organize one image; returns the same result dict as ScreenshotOrganizer.organize_file
 
-        for ext in self.config['image_extensions']:
-            images.extend(folder_path.glob(f"*{ext}"))
-            images.extend(folder_path.glob(f"*{ext.upper()}"))
+        Errors are reported in the result, like in the sync API. A cancelled
+        file isn't counted in the statistics unless its move/copy had started.
+        """
+        import asyncio
 
-        return images
+        await self._open_caches()
+        organizer = self.organizer
+        start = time.perf_counter()
+        try:
+            record, known = await self._stage('load', self._load, str(path))
+            if known:
+                result = await self._stage('place', self._place, record, *known)
+            else:
+                await self._models()
+                ocr_text, clip_result = await asyncio.gather(self._stage('ocr', self._ocr, record),
+                                                             self._classify(record))
+                result = await self._stage('place', self._place, record, None, ocr_text, clip_result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            organizer._count('total')
+            organizer._count('failed')
+            result = organizer._file_result(path, error=e)
 
-    def organize_once(self, source_folder=None):
-        """Organize all images in folder once"""
-        source = source_folder or self.config['source_folder']
+        if result['status'] == 'ok':
+            if record.decode_seconds is not None:
+                organizer.metrics.record('decode', record.decode_seconds)
+            organizer.metrics.record('total', time.perf_counter() - start)
+            record.release()
+            print(f"{'♻️  ' if known else ''}{record.name} → {result['destination']}")
+        else:
+            print(f"❌ {os.path.basename(str(path))}: {result['error']}")
+        return result
 
-        print(f"\n🚀 Starting one-time organization...")
-        print(f"📂 Source: {source}")
-        print(f"📂 Destination: {self.config['destination_folder']}\n")
+    async def organize_stream(self, paths):
+        """
+        Organize paths as they come in; yields each result dict as soon as it's done
 
-        # Initialize models
-        self.initialize_models()
+        paths may be a normal or an async iterable (e.g. watch_paths(), or
+        a generator fed by the service's own events). New paths are taken
+        while earlier files are still being organized, up to max_in_flight
+        at a time; results come in the order files finish. A plain iterable
+        is read on the event loop, so pass a list rather than a slow
+        generator. Closing the stream early (or cancelling the task reading
+        it) cancels the files still in progress.
+        """
+        import asyncio
 
-        # Find images
-        images = self.find_images(source)
+        self._setup()
+        results = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        tasks = set()
+        end_of_input = object()
 
-        if not images:
-            print("❌ No images found!")
-            return
+        def finished(task):
+            tasks.discard(task)
+            slots.release()
+            if not task.cancelled():
+                results.put_nowait(task)
 
-        print(f"📸 Found {len(images)} images\n")
+        async def feed():
+            try:
+                async for path in self._aiter(paths):
+                    await slots.acquire()
+                    task = asyncio.ensure_future(self.organize_file(path))
+                    tasks.add(task)
+                    task.add_done_callback(finished)
+                if tasks:
+                    await asyncio.wait(set(tasks))
+            finally:
+                results.put_nowait(end_of_input)
 
-        # Process each image
-        for i, image_path in enumerate(images, 1):
-            print(f"\n[{i}/{len(images)}]")
-            self.organize_file(str(image_path))
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                task = await results.get()
+                if task is end_of_input:
+                    break
+                yield task.result()
+            await feeder  # raises what the paths iterable raised
+        finally:
+            feeder.cancel()
+            for task in list(tasks):
+                task.cancel()
+            await asyncio.gather(feeder, *tasks, return_exceptions=True)
 
-        # Print summary
-        self.print_summary()
+    @staticmethod
+    async def _aiter(paths):
+        if hasattr(paths, '__aiter__'):
+            async for path in paths:
+                yield path
+        else:
+            for path in paths:
+                yield path
 
-    def watch_mode(self, source_folder=None):
+    async def watch(self, source=None):
+        """Organize new screenshots in source as they appear (like --watch); yields each result"""
+        async for result in self.organize_stream(self.watch_paths(source)):
+            yield result
+
+    async def watch_paths(self, source=None):
         """
-        Watch folder and organize new images continuously
+        Yield images that appear in source, once they're completely written
 
-        Monitors the source folder every 5 seconds for new screenshots
-        Automatically organizes them as they appear
-        Press Ctrl+C to stop watching
+        Uses filesystem events through watchdog with the same debouncing as
+        watch mode, or checks the folder every watch_interval seconds
+        without it. Images already there when watching starts are left alone.
         """
-        source = source_folder or self.config['source_folder']
+        import asyncio
 
-        print(f"\n👀 Starting watch mode...")
-        print(f"📂 Watching: {source}")
-        print(f"📂 Destination: {self.config['destination_folder']}")
-        print("Press Ctrl+C to stop\n")
+        organizer = self.organizer
+        source = os.path.expanduser(source or organizer.config['source_folder'])
+        loop = asyncio.get_running_loop()
 
-        # Initialize models
-        self.initialize_models()
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            Observer = None
+        if not organizer.config['watch_events'] or Observer is None:
+            def scan():
+                return {str(path) for path in organizer.iter_images(source)}
 
-        # Track processed files
-        processed_files = set(str(p) for p in self.find_images(source))
+            known = await loop.run_in_executor(None, scan)
+            while True:
+                await asyncio.sleep(organizer.config['watch_interval'])
+                current = await loop.run_in_executor(None, scan)
+                for path in sorted(current - known):
+                    yield path
+                known = current
+
+        is_candidate = organizer._watch_filter(source)
+        debounce = organizer.config['watch_debounce_seconds']
+        ready = asyncio.Queue()
+        timers = {}  # path -> TimerHandle, until it's quiet for long enough
+
+        def schedule(path, delay):
+            if is_candidate(path):
+                forget(path)
+                timers[path] = loop.call_later(delay, release, path)
+
+        def release(path):
+            timers.pop(path, None)
+            if os.path.isfile(path):
+                ready.put_nowait(path)
+
+        def forget(path):
+            timer = timers.pop(path, None)
+            if timer:
+                timer.cancel()
+
+        class Handler(FileSystemEventHandler):
+            # Called on watchdog's thread; hand everything to the event loop
+            def on_created(self, event):
+                if not event.is_directory:
+                    loop.call_soon_threadsafe(schedule, event.src_path, debounce)
+
+            def on_modified(self, event):
+                if not event.is_directory:
+                    loop.call_soon_threadsafe(schedule, event.src_path, debounce)
+
+            def on_closed(self, event):
+                if not event.is_directory:
+                    loop.call_soon_threadsafe(schedule, event.src_path, min(debounce, 0.05))
+
+            def on_moved(self, event):
+                if not event.is_directory:
+                    loop.call_soon_threadsafe(forget, event.src_path)
+                    loop.call_soon_threadsafe(schedule, event.dest_path, min(debounce, 0.05))
+
+            def on_deleted(self, event):
+                loop.call_soon_threadsafe(forget, event.src_path)
 
+        observer = Observer()
+        observer.schedule(Handler(), os.path.abspath(source), recursive=organizer.config['recursive'])
+        observer.start()
         try:
             while True:
-                # Find current images
-                current_images = set(str(p) for p in self.find_images(source))
+                yield await ready.get()
+        finally:
+            observer.stop()
+            for timer in timers.values():
+                timer.cancel()
+            await loop.run_in_executor(None, observer.join)
 
-                # Find new images
-                new_images = current_images - processed_files
 
-                if new_images:
-                    print(f"\n🆕 Found {len(new_images)} new image(s)")
-                    for image_path in new_images:
-                        self.organize_file(image_path)
-                        processed_files.add(image_path)
+def submit_job(path, socket_path):
+    """
+    Thin client for --serve: send one path to the daemon and stream the results
 
-                # Wait before next check
-                time.sleep(5)
+    Doesn't import any ML library, so it starts instantly. Returns a process
+    exit code: 0 if every file was organized, 1 otherwise.
+    """
+    import socket
 
-        except KeyboardInterrupt:
-            print("\n\n⏹️  Stopped watching")
-            self.print_summary()
+    socket_path = os.path.expanduser(socket_path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError as e:
+        print(f"❌ Can't reach the organizer daemon at {socket_path}: {e}")
+        print("💡 Start it with: python organize_screenshots.py --serve")
+        return 1
 
-    def print_summary(self):
-        """Print organization summary"""
-        print("\n" + "="*50)
-        print("📊 ORGANIZATION SUMMARY")
-        print("="*50)
-        print(f"Total images found: {self.stats['total']}")
-        print(f"Successfully processed: {self.stats['processed']}")
-        print(f"Failed: {self.stats['failed']}")
-        print("\n📁 Categories:")
-        for category, count in sorted(self.stats['categories'].items()):
-            print(f"  {category}: {count}")
-        print("="*50 + "\n")
+    request = {'action': 'organize', 'path': os.path.abspath(path)}
+    sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+
+    exit_code = 1
+    with sock, sock.makefile('r', encoding='utf-8') as replies:
+        for line in replies:
+            message = json.loads(line)
+
+            if message.get('done'):
+                if message.get('error'):
+                    print(f"❌ {message['error']}")
+                else:
+                    print(f"\n📊 Processed: {message['processed']}, Failed: {message['failed']}")
+                    exit_code = 0 if message['failed'] == 0 else 1
+                break
+
+            name = os.path.basename(message['source'])
+            if message['status'] == 'ok':
+                print(f"✅ {name} → {message['destination']}")
+            else:
+                print(f"❌ {name}: {message['error']}")
+
+    return exit_code
+
+
+def parse_shard(value):
+    """argparse type for --shard: 'i/N' with 0 <= i < N"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N like 0/4, got '{value}'")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 0 and {max(count, 1) - 1}, got '{value}'")
+    return index, count
 
 
 def main():
@@ -439,6 +4995,36 @@ Examples:
 
   # Custom source and destination
   python organize_screenshots.py --source ~/Downloads --dest ~/Pictures/Screenshots
+
+  # Include subfolders
+  python organize_screenshots.py --source ~/Downloads --recursive
+
+  # Continue an interrupted run where it stopped
+  python organize_screenshots.py --source ~/Downloads --resume
+
+  # Parallel pipeline on a big folder (8 workers)
+  python organize_screenshots.py --source ~/Downloads --workers 8
+
+  # Per-stage timing report (JSON, or Prometheus text with --metrics-format)
+  python organize_screenshots.py --metrics metrics.json
+
+  # Find organized screenshots by content or by look
+  python organize_screenshots.py --search "python stack trace"
+  python organize_screenshots.py --similar ~/Desktop/screenshot.png
+
+  # Edited the categories? Re-sort organized screenshots without re-running the models
+  python organize_screenshots.py --reclassify --dry-run
+  python organize_screenshots.py --reclassify
+
+  # Split a big shared archive across 3 processes/hosts, then combine the results
+  python organize_screenshots.py --source /mnt/archive --shard 0/3   # host A
+  python organize_screenshots.py --source /mnt/archive --shard 1/3   # host B
+  python organize_screenshots.py --source /mnt/archive --shard 2/3   # host C
+  python organize_screenshots.py --source /mnt/archive --merge-shards
+
+  # Keep models loaded in a daemon, then submit files instantly
+  python organize_screenshots.py --serve
+  python organize_screenshots.py --submit ~/Downloads/screenshot.png
         """
     )
 
@@ -450,8 +5036,40 @@ Examples:
                        help='Watch mode: continuously monitor and organize new screenshots')
     parser.add_argument('--config', '-c', default='config.json',
                        help='Path to config file (default: config.json)')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                       help='Also organize images in subfolders of the source folder')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted run: skip images it already organized')
+    parser.add_argument('--workers', '-j', type=int,
+                       help='Run the parallel pipeline with N workers (default: 1, serial)')
+    parser.add_argument('--shard', metavar='I/N', type=parse_shard,
+                       help='Organize only shard I of N (0-based) of the source folder, together with other processes')
+    parser.add_argument('--merge-shards', action='store_true',
+                       help='Combine the reports of a --shard run into one summary')
+    parser.add_argument('--serve', action='store_true',
+                       help='Daemon mode: keep models loaded and accept jobs on a Unix socket')
+    parser.add_argument('--submit', metavar='PATH',
+                       help='Send a file or folder to a running --serve daemon')
+    parser.add_argument('--socket',
+                       help='Unix socket path for --serve/--submit (default: ~/.screenshot_organizer.sock)')
+    parser.add_argument('--search', metavar='TEXT',
+                       help='Find organized screenshots matching a text description')
+    parser.add_argument('--similar', metavar='PATH',
+                       help='Find organized screenshots that look like this image')
+    parser.add_argument('--top-k', type=int, default=10,
+                       help='Number of --search/--similar results (default: 10)')
+    parser.add_argument('--reclassify', action='store_true',
+                       help='Re-categorize organized screenshots for the current config from the embedding index')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='With --reclassify: only list what would move')
+    parser.add_argument('--metrics', metavar='PATH',
+                       help='Write per-stage timings and throughput to PATH (refreshed live in --watch/--serve)')
+    parser.add_argument('--metrics-format', choices=['json', 'prometheus'],
+                       help='Format of the --metrics file (default: json)')
 
     args = parser.parse_args()
+    if args.shard and (args.watch or args.serve or args.submit):
+        parser.error('--shard only works for one-time runs')
 
     # Create organizer
     organizer = ScreenshotOrganizer(args.config)
@@ -461,12 +5079,38 @@ Examples:
         organizer.config['source_folder'] = args.source
     if args.dest:
         organizer.config['destination_folder'] = args.dest
+    if args.recursive:
+        organizer.config['recursive'] = True
+    if args.workers:
+        organizer.config['workers'] = args.workers
+    if args.socket:
+        organizer.config['socket_path'] = args.socket
+    if args.metrics:
+        organizer.config['metrics_file'] = args.metrics
+    if args.metrics_format:
+        organizer.config['metrics_format'] = args.metrics_format
+    if args.shard:
+        organizer.shard = args.shard
 
     # Run in appropriate mode
-    if args.watch:
-        organizer.watch_mode()
+    if args.submit:
+        sys.exit(submit_job(args.submit, organizer.config['socket_path']))
+    elif args.search or args.similar:
+        sys.exit(organizer.search(args.search, args.similar, args.top_k))
+    elif args.merge_shards:
+        sys.exit(organizer.merge_shards())
+    elif args.reclassify:
+        sys.exit(organizer.reclassify(dry_run=args.dry_run))
     else:
-        organizer.organize_once()
+        try:
+            if args.serve:
+                organizer.serve()
+            elif args.watch:
+                organizer.watch_mode()
+            else:
+                organizer.organize_once(resume=args.resume)
+        finally:
+            organizer.cleanup()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,85 @@
+"""
+Regression tests for the run journal and --resume recovery
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from organize_screenshots import ScreenshotOrganizer
+
+
+def make_organizer(tmp_path):
+    config = {
+        'source_folder': str(tmp_path / 'src'),
+        'destination_folder': str(tmp_path / 'dst'),
+        'cache_folder': str(tmp_path / 'cache'),
+        'organize_by_date': False,
+        'embedding_index': False,
+    }
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(config))
+    return ScreenshotOrganizer(str(config_path))
+
+
+def test_failed_transfer_does_not_roll_back_next_image(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    first, second = source / 'a.png', source / 'b.png'
+    first.write_bytes(b'first image')
+    second.write_bytes(b'second image, a different size')
+
+    organizer = make_organizer(tmp_path)
+    organizer.open_journal(str(source))
+    transfer = organizer.placement.transfer
+
+    def fail_once(src, *args, **kwargs):
+        if src == str(first):
+            raise PermissionError(src)
+        return transfer(src, *args, **kwargs)
+
+    organizer.placement.transfer = fail_once
+    with pytest.raises(PermissionError):
+        organizer.place_file(str(first), 'Code', '')
+    placed = organizer.place_file(str(second), 'Code', '')
+    # Both images wanted the same generated name
+    assert placed.parent == tmp_path / 'dst' / 'Code'
+    assert not second.exists()
+
+    # Killed before the run finished: the journal stays for --resume
+    organizer.journal._file.close()
+    organizer.journal = None
+
+    resumed = make_organizer(tmp_path)
+    resumed.open_journal(str(source), resume=True)
+    assert placed.read_bytes() == b'second image, a different size'
+    assert first.exists()
+    resumed.journal.close()
+
+
+def test_resume_rolls_back_unclaimed_partial_copy(tmp_path):
+    source = tmp_path / 'src'
+    source.mkdir()
+    image = source / 'a.png'
+    image.write_bytes(b'image')
+
+    organizer = make_organizer(tmp_path)
+    organizer.open_journal(str(source))
+    destination = tmp_path / 'dst' / 'Code' / 'a.png'
+    destination.parent.mkdir(parents=True)
+    organizer.journal.intent(str(image), str(destination), 'Code', os.stat(image))
+    # Crash after the copy, before the source was removed
+    destination.write_bytes(image.read_bytes())
+    organizer.journal._file.close()
+    organizer.journal = None
+
+    resumed = make_organizer(tmp_path)
+    resumed.open_journal(str(source), resume=True)
+    assert not destination.exists()
+    assert image.exists()
+    resumed.journal.close()